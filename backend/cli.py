@@ -0,0 +1,274 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+from backend.schemas.schemas import ManifestReport
+from backend.services.dependency_parser import (
+    ECOSYSTEMS,
+    MSBUILD_FILE_TYPES,
+    DependencyParser,
+    detect_manifest_type,
+)
+from backend.services.license_resolver import (
+    DEFAULT_RESOLVE_WORKERS,
+    LicenseResolver,
+)
+from backend.services.msbuild_parser import MSBuildParser
+
+# Directories that never contain manifests of the scanned project itself
+SKIPPED_DIRS = {
+    ".git",
+    ".hg",
+    ".svn",
+    ".venv",
+    "venv",
+    "node_modules",
+    "__pycache__",
+    "bin",
+    "obj",
+}
+
+# Seconds between progress lines on stderr
+PROGRESS_INTERVAL = 2.0
+
+# Manifests submitted to the parser pool per worker, bounding memory use
+PENDING_PER_WORKER = 4
+
+# Parsed manifests waiting for their license lookups, bounding memory use
+MAX_RESOLVING_MANIFESTS = 256
+
+
+def find_manifests(paths: List[str]) -> Iterator[Tuple[str, str]]:
+    """Walk directory trees and yield the supported manifests they contain
+
+    Args:
+        paths: Directories or manifest files to scan
+
+    Yields:
+        Tuples of (manifest path, dependency file type)
+    """
+    for path in paths:
+        if os.path.isfile(path):
+            file_type = detect_manifest_type(os.path.basename(path))
+            if file_type:
+                yield path, file_type
+            continue
+
+        for root, dirs, files in os.walk(path):
+            dirs[:] = [name for name in dirs if name not in SKIPPED_DIRS]
+            for filename in files:
+                file_type = detect_manifest_type(filename)
+                if file_type:
+                    yield os.path.join(root, filename), file_type
+
+
+def read_manifest(path: str) -> str:
+    """Read a manifest, handling UTF-16 files saved by Windows tools"""
+    with open(path, "rb") as f:
+        content = f.read()
+    if content.startswith(b"\xff\xfe") or content.startswith(b"\xfe\xff"):
+        try:
+            return content.decode("utf-16")
+        except UnicodeDecodeError:
+            pass
+    return content.decode("utf-8", errors="replace")
+
+
+# Shared by the manifests parsed in a worker process, so the Directory.* files
+# a project imports are read once per worker
+msbuild_parser = MSBuildParser()
+
+
+def parse_manifest(
+    path: str, file_type: str
+) -> Tuple[List[Tuple[str, Optional[str]]], Optional[str]]:
+    """Parse a manifest in a worker process
+
+    MSBuild projects are resolved against the Directory.Packages.props and
+    Directory.Build.props/targets that apply to them, so centrally managed
+    versions and packages referenced for every project are picked up.
+
+    Args:
+        path: The path of the manifest
+        file_type: The dependency file type of the manifest
+
+    Returns:
+        A tuple of ((package name, version) tuples, error message or None)
+    """
+    try:
+        if file_type in MSBUILD_FILE_TYPES:
+            return msbuild_parser.parse_project_file(path), None
+        parser = DependencyParser(strict=True)
+        return parser.parse_dependency_records(read_manifest(path), file_type), None
+    except Exception as e:
+        return [], str(e)
+
+
+class ScanStats:
+    """Progress and throughput counters of a scan, reported on stderr"""
+
+    def __init__(self, stream: TextIO = sys.stderr):
+        self.stream = stream
+        self.started = time.monotonic()
+        self.last_report = self.started
+        self.manifests = 0
+        self.packages = 0
+        self.errors = 0
+
+    def update(self, report: ManifestReport) -> None:
+        self.manifests += 1
+        self.packages += len(report.packages)
+        if report.error:
+            self.errors += 1
+
+    def report(self, resolver: LicenseResolver, final: bool = False) -> None:
+        now = time.monotonic()
+        if not final and now - self.last_report < PROGRESS_INTERVAL:
+            return
+        self.last_report = now
+        elapsed = max(now - self.started, 1e-9)
+        print(
+            f"{'done' if final else 'scanning'}: {self.manifests} manifests "
+            f"({self.manifests / elapsed:.1f}/s), {self.packages} packages "
+            f"({self.packages / elapsed:.1f}/s), {resolver.lookups} lookups, "
+            f"{resolver.hits} deduplicated, {self.errors} errors, {elapsed:.1f}s",
+            file=self.stream,
+            flush=True,
+        )
+
+
+def scan(
+    paths: List[str],
+    output: TextIO,
+    workers: Optional[int] = None,
+    resolver: Optional[LicenseResolver] = None,
+) -> ScanStats:
+    """Scan directory trees and stream one JSON line per manifest
+
+    Manifests are parsed on a process pool while packages are resolved through a
+    shared resolver, so every package is looked up once across the whole scan.
+    Lookups start as soon as a manifest is parsed, and each record is written
+    when its own lookups finish, so slow lookups never stall the parser pool.
+
+    Args:
+        paths: Directories or manifest files to scan
+        output: The stream the JSONL records are written to
+        workers: The number of parser processes, defaults to the number of CPUs
+        resolver: The license resolver to use
+
+    Returns:
+        The statistics of the scan
+
+    Raises:
+        Exception: If the license analyzer cannot be created, before anything
+            is scanned
+    """
+    workers = workers or os.cpu_count() or 1
+    resolver = resolver or LicenseResolver()
+    # Fail fast instead of reporting every package as Unknown
+    resolver.get_analyzer()
+    stats = ScanStats()
+    manifests = find_manifests(paths)
+    max_parsing = workers * PENDING_PER_WORKER
+    parsing: Dict[Future, Tuple[str, str]] = {}
+    resolving: Dict[Future, Tuple[str, str, Optional[str]]] = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        exhausted = False
+        while parsing or resolving or not exhausted:
+            # Keep a bounded number of manifests in flight, parsing or resolving
+            while (
+                not exhausted
+                and len(parsing) < max_parsing
+                and len(parsing) + len(resolving)
+                < max_parsing + MAX_RESOLVING_MANIFESTS
+            ):
+                manifest = next(manifests, None)
+                if manifest is None:
+                    exhausted = True
+                    break
+                parsing[pool.submit(parse_manifest, *manifest)] = manifest
+            if not parsing and not resolving:
+                break
+
+            done, _ = wait([*parsing, *resolving], return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in parsing:
+                    # Start the lookups right away, the record is written once
+                    # they have all finished
+                    path, file_type = parsing.pop(future)
+                    packages, error = future.result()
+                    lookups = resolver.resolve_async(packages, ECOSYSTEMS[file_type])
+                    resolving[lookups] = (path, file_type, error)
+                    continue
+
+                path, file_type, error = resolving.pop(future)
+                report = ManifestReport(
+                    path=path,
+                    file_type=file_type,
+                    ecosystem=ECOSYSTEMS[file_type],
+                    packages=future.result(),
+                    error=error,
+                )
+                output.write(report.model_dump_json() + "\n")
+                output.flush()
+                stats.update(report)
+            stats.report(resolver)
+
+    resolver.close()
+    stats.report(resolver, final=True)
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point of the licensage command line interface"""
+    parser = argparse.ArgumentParser(
+        prog="licensage", description="Headless license compliance scanner"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    scan_parser = subparsers.add_parser(
+        "scan", help="Scan directory trees for dependency manifests"
+    )
+    scan_parser.add_argument(
+        "paths", nargs="+", help="Directories or manifest files to scan"
+    )
+    scan_parser.add_argument(
+        "-o", "--output", help="Write JSONL results to this file instead of stdout"
+    )
+    scan_parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of parser processes (default: number of CPUs)",
+    )
+    scan_parser.add_argument(
+        "--resolve-workers",
+        type=int,
+        default=DEFAULT_RESOLVE_WORKERS,
+        help="Number of concurrent license lookups",
+    )
+
+    args = parser.parse_args(argv)
+    resolver = LicenseResolver(max_workers=args.resolve_workers)
+    try:
+        resolver.get_analyzer()
+    except Exception as e:
+        resolver.close()
+        print(f"licensage: cannot create the license analyzer: {e}", file=sys.stderr)
+        return 2
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            stats = scan(args.paths, output, args.workers, resolver)
+    else:
+        stats = scan(args.paths, sys.stdout, args.workers, resolver)
+    return 1 if stats.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,5 @@
+from typing import List
+
 from pydantic_settings import BaseSettings
 
 
@@ -8,6 +10,27 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str
     GOOGLE_API_KEY: str
 
+    # Application settings
+    DEFAULT_MODEL: str = "gpt-4"
+    DEBUG: bool = False
+
+    # Admission control for analysis requests, per worker process
+    ADMISSION_MAX_ACTIVE: int = 8
+    ADMISSION_MAX_QUEUE: int = 64
+    ADMISSION_CLIENT_CONCURRENCY: int = 2
+    ADMISSION_CLIENT_QUEUE: int = 16
+    ADMISSION_CLIENT_RATE: float = 1.0
+    ADMISSION_CLIENT_BURST: int = 10
+    ADMISSION_QUEUE_TIMEOUT: float = 30.0
+    # Proxy addresses or networks allowed to identify clients with X-Client-ID
+    ADMISSION_TRUSTED_PROXIES: List[str] = []
+
+    # Registry metadata cache, exact released versions never expire
+    REGISTRY_LATEST_TTL: float = 3600.0
+    REGISTRY_NEGATIVE_TTL: float = 600.0
+    REGISTRY_CACHE_SIZE: int = 10000
+    REGISTRY_TIMEOUT: float = 10.0
+
 
 # Create settings instance
 settings = Settings(_env_file=".env")
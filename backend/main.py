@@ -4,6 +4,10 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from backend.routes.dependency_file import router as dependency_router
 from backend.routes.github import router as github_router
+from backend.routes.policy import router as policy_router
+from backend.routes.sbom import router as sbom_router
+from backend.services.admission import admission_controller
+from backend.services.registry_client import registry_client
 from backend.utils.logger_utils import get_logger
 
 logger = get_logger(__name__)
@@ -27,6 +31,8 @@ app.add_middleware(
 # Include routers
 app.include_router(github_router, prefix="/api/github", tags=["GitHub"])
 app.include_router(dependency_router, prefix="/api/dependency", tags=["Dependency"])
+app.include_router(policy_router, prefix="/api/policy", tags=["Policy"])
+app.include_router(sbom_router, prefix="/api/sbom", tags=["SBOM"])
 
 
 @app.get("/", tags=["Root"])
@@ -40,5 +46,17 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics/admission", tags=["Health"])
+async def admission_metrics():
+    """Queue depth and wait time of analysis requests in this worker"""
+    return admission_controller.metrics()
+
+
+@app.get("/metrics/registry", tags=["Health"])
+async def registry_metrics():
+    """Hit, miss and revalidation counts of the registry metadata cache"""
+    return registry_client.stats()
+
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
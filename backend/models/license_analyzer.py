@@ -1,11 +1,12 @@
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from langchain.chains import LLMChain
 from langchain.prompts import PromptTemplate
 from langchain_openai import ChatOpenAI
 
 from backend.config import settings
+from backend.services.registry_client import registry_client
 
 
 class LicenseAnalyzer:
@@ -82,21 +83,29 @@ Format your response as a JSON object with the following structure:
             }
 
     def get_package_license(
-        self, package_name: str, ecosystem: str = "python"
+        self,
+        package_name: str,
+        ecosystem: str = "python",
+        version: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Get license information for a package
 
+        Only the license identifier is read from the package registry. Registries
+        do not ship the license text, so the permissions, limitations and
+        obligations are returned empty; use analyze_license on the license text
+        to fill them in.
+
         Args:
             package_name: The name of the package
             ecosystem: The package ecosystem (python, npm, etc.)
+            version: The exact version of the package, or None for the latest
 
         Returns:
-            A dictionary containing the license information
+            A dictionary containing the license type and empty term lists
         """
-        # TODO: Implement fetching license information from package repositories
-        # For now, return a placeholder
+        metadata = registry_client.get_metadata(package_name, ecosystem, version)
         return {
-            "license_type": "Unknown",
+            "license_type": (metadata or {}).get("license") or "Unknown",
             "permissions": [],
             "limitations": [],
             "obligations": [],
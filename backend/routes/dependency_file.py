@@ -2,10 +2,13 @@ import os
 import tempfile
 import uuid
 
-from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 
 from backend.schemas.schemas import LicenseInfo, LicenseReport
+from backend.services.admission import admit_analysis
 from backend.services.dependency_parser import DependencyParser
+from backend.services.policy_engine import evaluate_policy
+from backend.services.report_store import report_store
 from backend.utils.logger_utils import get_logger
 
 router = APIRouter()
@@ -18,7 +21,9 @@ TEMP_DIR = os.path.join(tempfile.gettempdir(), "licenSage-uploads")
 os.makedirs(TEMP_DIR, exist_ok=True)
 
 
-@router.post("/upload", response_model=LicenseReport)
+@router.post(
+    "/upload", response_model=LicenseReport, dependencies=[Depends(admit_analysis)]
+)
 async def upload_dependency_file(file: UploadFile = File(...)):
     """Upload and analyze a dependency file"""
     try:
@@ -62,9 +67,9 @@ async def upload_dependency_file(file: UploadFile = File(...)):
         with open(file_path, "r", encoding="utf-8", errors="replace") as f:
             content = f.read()
 
-        # Parse the dependency file to extract package names
+        # Parse the dependency file to extract package names and versions
         parser = DependencyParser()
-        packages = parser.parse_dependency_file(content=content, file_type=file_type)
+        packages = parser.parse_dependency_records(content=content, file_type=file_type)
         logger.info(f"Parsed {len(packages)} packages from uploaded file")
 
         # Resources used for analysis
@@ -80,8 +85,8 @@ async def upload_dependency_file(file: UploadFile = File(...)):
 
         # For demonstration purposes, create placeholder license info
         license_info = []
-        for package in packages:  # Limit to 5 packages for demo
-            logger.info(f"Analyzing license for package: {package}")
+        for package, version in packages:  # Limit to 5 packages for demo
+            logger.info(f"Analyzing license for package: {package} {version or ''}")
             # In a real implementation, we would use a license analyzer to get real license data
             # from ..models.license_analyzer import LicenseAnalyzer
             # analyzer = LicenseAnalyzer()
@@ -90,6 +95,7 @@ async def upload_dependency_file(file: UploadFile = File(...)):
             license_info.append(
                 LicenseInfo(
                     package_name=package,
+                    version=version,
                     license_type="MIT",  # Placeholder
                     permissions=[
                         "commercial-use",
@@ -112,7 +118,13 @@ async def upload_dependency_file(file: UploadFile = File(...)):
         logger.info(
             f"Successfully analyzed {len(license_info)} packages from uploaded file"
         )
-        return LicenseReport(packages=license_info, resources_used=resources_used)
+
+        # Check the packages against the organisation policy and keep the report
+        # so it can be re-evaluated against other policies later
+        report = LicenseReport(packages=license_info, resources_used=resources_used)
+        report.policy = evaluate_policy(report.packages)
+        report_store.save(report)
+        return report
     except Exception as e:
         logger.error(f"Error processing uploaded file: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -128,8 +140,12 @@ def get_file_type(filename):
         return "package.json"
     elif filename.endswith(".toml"):
         return "pyproject.toml"
-    elif filename.endswith(".csproj") or filename.endswith(".xml"):
+    elif filename.endswith((".csproj", ".fsproj", ".vbproj", ".xml")):
         return ".csproj"
+    elif filename.endswith(".config"):
+        return "packages.config"
+    elif filename.endswith(".props"):
+        return "Directory.Packages.props"
     else:
         return "unknown"
 
@@ -1,6 +1,9 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 
 from backend.schemas.schemas import LicenseInfo, LicenseReport, GithubRepo
+from backend.services.admission import admit_analysis
+from backend.services.policy_engine import evaluate_policy
+from backend.services.report_store import report_store
 from backend.utils.logger_utils import get_logger
 
 router = APIRouter()
@@ -9,7 +12,9 @@ router = APIRouter()
 logger = get_logger(__name__)
 
 
-@router.post("/analyze", response_model=LicenseReport)
+@router.post(
+    "/analyze", response_model=LicenseReport, dependencies=[Depends(admit_analysis)]
+)
 async def analyze_github_repo(repo: GithubRepo):
     """Analyze a GitHub repository for license information"""
     try:
@@ -54,7 +59,13 @@ async def analyze_github_repo(repo: GithubRepo):
         logger.info(
             f"Successfully analyzed {len(license_info)} packages from GitHub repository: {repo.url}"
         )
-        return LicenseReport(packages=license_info, resources_used=resources_used)
+
+        # Check the packages against the organisation policy and keep the report
+        # so it can be re-evaluated against other policies later
+        report = LicenseReport(packages=license_info, resources_used=resources_used)
+        report.policy = evaluate_policy(report.packages)
+        report_store.save(report)
+        return report
     except Exception as e:
         logger.error(f"Error analyzing GitHub repository: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
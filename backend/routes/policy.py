@@ -0,0 +1,54 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException
+
+from backend.schemas.schemas import LicensePolicy, LicenseReport, PolicyEvaluation
+from backend.services.policy_engine import DEFAULT_POLICY, evaluate_policy
+from backend.services.report_store import report_store
+from backend.utils.logger_utils import get_logger
+
+router = APIRouter()
+
+# Set up logger
+logger = get_logger(__name__)
+
+
+@router.get("/default", response_model=LicensePolicy)
+async def get_default_policy():
+    """Get the organisation policy applied to new reports"""
+    return DEFAULT_POLICY
+
+
+@router.post("/reports/{report_id}/evaluate", response_model=PolicyEvaluation)
+async def evaluate_stored_report(
+    report_id: str, policy: Optional[LicensePolicy] = None
+):
+    """Evaluate a stored report against a policy without re-analyzing it
+
+    The organisation policy is applied when no policy is given.
+
+    Reports are stored per worker process, so with several workers a report id
+    is only found by the worker that produced it; use /evaluate otherwise.
+    """
+    report = report_store.get(report_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail=f"Report not found: {report_id}")
+
+    policy = policy or DEFAULT_POLICY
+    logger.info(f"Evaluating report {report_id} against policy: {policy.name}")
+    return evaluate_policy(report.packages, policy)
+
+
+@router.post("/evaluate", response_model=PolicyEvaluation)
+async def evaluate_report(
+    report: LicenseReport, policy: Optional[LicensePolicy] = None
+):
+    """Evaluate a report supplied by the client against a policy
+
+    The organisation policy is applied when no policy is given.
+    """
+    policy = policy or DEFAULT_POLICY
+    logger.info(
+        f"Evaluating {len(report.packages)} packages against policy: {policy.name}"
+    )
+    return evaluate_policy(report.packages, policy)
@@ -0,0 +1,78 @@
+from typing import Dict, Literal
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from backend.services.report_store import report_store
+from backend.services.sbom_writer import SBOM_FORMATS, stream_sbom
+from backend.utils.logger_utils import get_logger
+
+router = APIRouter()
+
+# Set up logger
+logger = get_logger(__name__)
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Check whether an Accept-Encoding header allows a gzip response
+
+    A gzip entry takes precedence over the ``*`` wildcard, and a quality value
+    of 0 means the encoding is not acceptable.
+
+    Args:
+        accept_encoding: The value of the Accept-Encoding header
+
+    Returns:
+        True if the response may be gzipped
+    """
+    qualities: Dict[str, float] = {}
+    for entry in accept_encoding.lower().split(","):
+        coding, *params = [part.strip() for part in entry.split(";")]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+
+    quality = qualities.get("gzip", qualities.get("x-gzip", qualities.get("*", 0.0)))
+    return quality > 0
+
+
+@router.get("/{report_id}/{sbom_format}")
+async def export_sbom(
+    report_id: str, sbom_format: Literal["cyclonedx", "spdx"], request: Request
+):
+    """Stream a stored report as a CycloneDX JSON or SPDX tag-value SBOM
+
+    The document is gzipped on the fly when the client accepts gzip encoding.
+    Reports are stored per worker process, so with several workers a report id
+    is only found by the worker that produced it.
+    """
+    report = report_store.get(report_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail=f"Report not found: {report_id}")
+
+    compress = accepts_gzip(request.headers.get("Accept-Encoding", ""))
+    _, media_type, extension = SBOM_FORMATS[sbom_format]
+    headers = {
+        "Content-Disposition": f'attachment; filename="{report_id}.{extension}"',
+        "Vary": "Accept-Encoding",
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+
+    logger.info(
+        f"Exporting report {report_id} as {sbom_format} "
+        f"({len(report.packages)} packages, gzip={compress})"
+    )
+    return StreamingResponse(
+        stream_sbom(report, sbom_format, compress),
+        media_type=media_type,
+        headers=headers,
+    )
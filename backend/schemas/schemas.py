@@ -1,19 +1,95 @@
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl, field_validator
+
+# Categories of LicenseInfo that carry license terms
+TERM_CATEGORIES = ("permissions", "limitations", "obligations")
 
 
 class LicenseInfo(BaseModel):
     package_name: str
+    version: Optional[str] = None
     license_type: Optional[str] = None
     permissions: Optional[List[str]] = None
     limitations: Optional[List[str]] = None
     obligations: Optional[List[str]] = None
 
 
+class LicensePolicy(BaseModel):
+    """Organisation policy applied to every package in a report.
+
+    Terms are written as ``<category>:<term>``, e.g. ``permissions:commercial-use``
+    or ``obligations:license-notice``, using the vocabulary of ``LicenseInfo``.
+
+    ``deny_licenses`` lists SPDX license ids. License types are normalised to
+    SPDX ids first, including PyPI classifiers and common long names, and a
+    package is denied if any id of its license expression matches, so
+    ``MIT OR AGPL-3.0-only`` is denied by ``AGPL-3.0``. Ids match whole ids,
+    never prefixes: ``MIT`` does not deny ``MIT-0``. An id without ``-only`` or
+    ``-or-later``, e.g. ``GPL-3.0``, matches both variants. Entries that are not
+    SPDX ids must equal the license type, ignoring case.
+
+    ``require_terms`` and ``flag_missing_terms`` only apply to packages whose
+    license text was analyzed. Packages resolved from registry metadata alone
+    have empty term lists and are never denied or flagged for a missing term.
+    """
+
+    name: str
+    deny_licenses: List[str] = Field(default_factory=list)
+    deny_terms: List[str] = Field(default_factory=list)
+    require_terms: List[str] = Field(default_factory=list)
+    flag_terms: List[str] = Field(default_factory=list)
+    flag_missing_terms: List[str] = Field(default_factory=list)
+    flag_unknown_license: bool = True
+
+    @field_validator("deny_terms", "require_terms", "flag_terms", "flag_missing_terms")
+    @classmethod
+    def validate_terms(cls, terms: List[str]) -> List[str]:
+        """Reject terms that would compile to a bit no package can ever set"""
+        for term in terms:
+            category, separator, name = term.partition(":")
+            if not separator or category.strip().lower() not in TERM_CATEGORIES:
+                raise ValueError(
+                    f"Invalid term {term!r}: expected <category>:<term> with a "
+                    f"category of {', '.join(TERM_CATEGORIES)}"
+                )
+            if not name.strip():
+                raise ValueError(f"Invalid term {term!r}: the term name is empty")
+        return terms
+
+
+class PolicyVerdict(BaseModel):
+    package_name: str
+    verdict: Literal["allow", "flag", "deny"]
+    reasons: List[str] = Field(default_factory=list)
+
+
+class PolicySummary(BaseModel):
+    total: int
+    allowed: int
+    flagged: int
+    denied: int
+
+
+class PolicyEvaluation(BaseModel):
+    policy_name: str
+    verdicts: List[PolicyVerdict]
+    summary: PolicySummary
+
+
 class LicenseReport(BaseModel):
     packages: List[LicenseInfo]
     resources_used: Optional[List[str]] = None
+    report_id: Optional[str] = None
+    policy: Optional[PolicyEvaluation] = None
+
+
+class ManifestReport(BaseModel):
+    path: str
+    file_type: str
+    ecosystem: str
+    packages: List[LicenseInfo]
+    error: Optional[str] = None
 
 
 class GithubRepo(BaseModel):
@@ -0,0 +1,319 @@
+import asyncio
+import ipaddress
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Any, AsyncIterator, Deque, Dict, List
+
+from fastapi import HTTPException, Request
+
+from backend.config import settings
+from backend.utils.logger_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Number of recent queue wait times kept for percentiles
+WAIT_TIME_WINDOW = 1024
+
+# Number of rate limit buckets kept before the least recently used is evicted
+MAX_TRACKED_CLIENTS = 10000
+
+# Proxies whose X-Client-ID header is trusted to identify the client
+TRUSTED_PROXIES = [
+    ipaddress.ip_network(proxy, strict=False)
+    for proxy in settings.ADMISSION_TRUSTED_PROXIES
+]
+
+
+class AdmissionRejected(Exception):
+    """Raised when analysis work cannot be admitted right now"""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class TokenBucket:
+    """Token bucket rate limiter for a single client"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self) -> bool:
+        """Take a token if one is available"""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def retry_after(self) -> float:
+        """Seconds until the next token is available"""
+        return (1 - self.tokens) / self.rate if self.rate > 0 else 60
+
+
+class AdmissionController:
+    """Admission control for analysis work with per-client backpressure
+
+    At most ``max_active`` requests run at once. Requests beyond that wait in a
+    bounded queue that is drained round-robin across clients, so one client with
+    many requests cannot starve the others. Each client is further limited by a
+    token bucket rate limit, a concurrency limit and a cap on its queued requests.
+    Requests that cannot be queued are rejected immediately instead of piling up.
+    """
+
+    def __init__(
+        self,
+        max_active: int = settings.ADMISSION_MAX_ACTIVE,
+        max_queue: int = settings.ADMISSION_MAX_QUEUE,
+        client_concurrency: int = settings.ADMISSION_CLIENT_CONCURRENCY,
+        client_queue: int = settings.ADMISSION_CLIENT_QUEUE,
+        client_rate: float = settings.ADMISSION_CLIENT_RATE,
+        client_burst: int = settings.ADMISSION_CLIENT_BURST,
+        queue_timeout: float = settings.ADMISSION_QUEUE_TIMEOUT,
+    ):
+        """Initialize the admission controller
+
+        Args:
+            max_active: The number of requests processed concurrently
+            max_queue: The number of requests waiting across all clients
+            client_concurrency: The number of requests processed per client
+            client_queue: The number of requests waiting per client
+            client_rate: The sustained requests per second allowed per client
+            client_burst: The number of requests a client may make in a burst
+            queue_timeout: Seconds a request may wait before it is rejected
+        """
+        self.max_active = max_active
+        self.max_queue = max_queue
+        self.client_concurrency = client_concurrency
+        self.client_queue = client_queue
+        self.client_rate = client_rate
+        self.client_burst = client_burst
+        self.queue_timeout = queue_timeout
+
+        self._active = 0
+        self._queued = 0
+        self._client_active: Dict[str, int] = {}
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {}
+        self._round_robin: Deque[str] = deque()
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+        self._admitted = 0
+        self._rejected: Dict[str, int] = {}
+        self._max_queue_depth = 0
+        self._wait_times: Deque[float] = deque(maxlen=WAIT_TIME_WINDOW)
+        self._service_time = 1.0
+
+    def _reject(self, reason: str, retry_after: float) -> AdmissionRejected:
+        self._rejected[reason] = self._rejected.get(reason, 0) + 1
+        return AdmissionRejected(reason, retry_after)
+
+    def _estimated_wait(self) -> float:
+        """Estimate the seconds until a new request would be admitted"""
+        return self._service_time * (self._queued + 1) / max(self.max_active, 1)
+
+    def _bucket(self, client: str) -> TokenBucket:
+        bucket = self._buckets.get(client)
+        if bucket is not None:
+            self._buckets.move_to_end(client)
+            return bucket
+        # Evict in O(1), so a flood of new addresses cannot slow every request
+        while len(self._buckets) >= MAX_TRACKED_CLIENTS:
+            self._buckets.popitem(last=False)
+        bucket = TokenBucket(self.client_rate, self.client_burst)
+        self._buckets[client] = bucket
+        return bucket
+
+    def _can_start(self, client: str) -> bool:
+        return (
+            self._active < self.max_active
+            and self._client_active.get(client, 0) < self.client_concurrency
+        )
+
+    def _start(self, client: str) -> None:
+        self._active += 1
+        self._admitted += 1
+        self._client_active[client] = self._client_active.get(client, 0) + 1
+
+    def _dispatch(self) -> None:
+        """Admit waiting requests, taking turns between clients"""
+        while self._active < self.max_active and self._round_robin:
+            for _ in range(len(self._round_robin)):
+                client = self._round_robin[0]
+                self._round_robin.rotate(-1)
+                if self._can_start(client):
+                    break
+            else:
+                # Every waiting client is at its concurrency limit
+                return
+
+            waiters = self._waiters[client]
+            waiter = waiters.popleft()
+            self._queued -= 1
+            if not waiters:
+                del self._waiters[client]
+                self._round_robin.remove(client)
+            self._start(client)
+            waiter.set_result(None)
+
+    def _dequeue(self, client: str, waiter: asyncio.Future) -> None:
+        """Remove a waiter that gave up before it was admitted"""
+        waiters = self._waiters.get(client)
+        if waiters is None or waiter not in waiters:
+            return
+        waiters.remove(waiter)
+        self._queued -= 1
+        if not waiters:
+            del self._waiters[client]
+            self._round_robin.remove(client)
+
+    async def acquire(self, client: str) -> None:
+        """Wait until a request of a client may start
+
+        Args:
+            client: The identifier of the client making the request
+
+        Raises:
+            AdmissionRejected: If the request is over a limit or the queue is full
+        """
+        bucket = self._bucket(client)
+        if not bucket.take():
+            raise self._reject("rate_limited", bucket.retry_after())
+
+        if not self._waiters.get(client) and self._can_start(client):
+            self._start(client)
+            self._wait_times.append(0.0)
+            return
+
+        if self._queued >= self.max_queue:
+            raise self._reject("queue_full", self._estimated_wait())
+        if len(self._waiters.get(client, ())) >= self.client_queue:
+            raise self._reject("client_queue_full", self._estimated_wait())
+
+        waiter = asyncio.get_running_loop().create_future()
+        if client not in self._waiters:
+            self._waiters[client] = deque()
+            self._round_robin.append(client)
+        self._waiters[client].append(waiter)
+        self._queued += 1
+        self._max_queue_depth = max(self._max_queue_depth, self._queued)
+
+        enqueued = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done():
+                # Admitted at the same moment it gave up, hand the slot back
+                self.release(client)
+            else:
+                waiter.cancel()
+                self._dequeue(client, waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                raise self._reject("queue_timeout", self._estimated_wait())
+            raise
+        self._wait_times.append(time.monotonic() - enqueued)
+
+    def release(self, client: str, service_time: float = 0.0) -> None:
+        """Mark a request of a client as finished and admit waiting requests
+
+        Args:
+            client: The identifier of the client making the request
+            service_time: Seconds the request took, used to estimate Retry-After
+        """
+        self._active -= 1
+        remaining = self._client_active.get(client, 1) - 1
+        if remaining:
+            self._client_active[client] = remaining
+        else:
+            self._client_active.pop(client, None)
+        if service_time:
+            self._service_time = 0.9 * self._service_time + 0.1 * service_time
+        self._dispatch()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, wait time and rejection metrics of this worker"""
+        wait_times: List[float] = sorted(self._wait_times)
+
+        def percentile(q: float) -> float:
+            if not wait_times:
+                return 0.0
+            return round(
+                wait_times[min(len(wait_times) - 1, int(q * len(wait_times)))], 4
+            )
+
+        return {
+            "active": self._active,
+            "max_active": self.max_active,
+            "queue_depth": self._queued,
+            "max_queue": self.max_queue,
+            "max_queue_depth_seen": self._max_queue_depth,
+            "queued_clients": len(self._waiters),
+            "active_clients": len(self._client_active),
+            "admitted": self._admitted,
+            "rejected": dict(self._rejected),
+            "wait_time_seconds": {
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": round(wait_times[-1], 4) if wait_times else 0.0,
+            },
+            "avg_service_time_seconds": round(self._service_time, 4),
+        }
+
+
+def is_trusted_proxy(host: str) -> bool:
+    """Check whether a connection comes from a configured trusted proxy"""
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in TRUSTED_PROXIES)
+
+
+def get_client_id(request: Request) -> str:
+    """Identify the client of a request by its connection address
+
+    The X-Client-ID header is unauthenticated, so it is only honoured on
+    connections from ADMISSION_TRUSTED_PROXIES; otherwise any client could pick
+    a new identity per request and bypass the per-client limits.
+    """
+    host = request.client.host if request.client else None
+    if host is None:
+        return "unknown"
+    client_id = request.headers.get("X-Client-ID")
+    if client_id and is_trusted_proxy(host):
+        return client_id
+    return host
+
+
+async def admit_analysis(request: Request) -> AsyncIterator[None]:
+    """FastAPI dependency holding an admission slot while a request is analyzed"""
+    client = get_client_id(request)
+    try:
+        await admission_controller.acquire(client)
+    except AdmissionRejected as e:
+        logger.warning(f"Rejected analysis request from {client}: {e.reason}")
+        raise HTTPException(
+            status_code=429,
+            detail=f"Too many requests: {e.reason}",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        admission_controller.release(client, time.monotonic() - started)
+
+
+# Create admission controller instance
+admission_controller = AdmissionController()
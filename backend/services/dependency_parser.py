@@ -1,34 +1,151 @@
+import fnmatch
+import io
 import json
 import re
-from typing import List
+import xml.etree.ElementTree as ET
+from typing import List, Optional, Tuple
 
 import tomli
 
+from backend.services.msbuild_parser import (
+    PROJECT_EXTENSIONS,
+    MSBuildFile,
+    MSBuildParser,
+)
+from backend.utils.logger_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Manifest filename patterns and the dependency file type they are parsed as
+MANIFEST_PATTERNS = {
+    "requirements*.txt": "requirements.txt",
+    "package.json": "package.json",
+    "pyproject.toml": "pyproject.toml",
+    **{f"*{extension}": ".csproj" for extension in PROJECT_EXTENSIONS},
+    "packages.config": "packages.config",
+}
+
+# Package ecosystem of each dependency file type
+ECOSYSTEMS = {
+    "requirements.txt": "python",
+    "pyproject.toml": "python",
+    "package.json": "npm",
+    ".csproj": "nuget",
+    "packages.config": "nuget",
+    "Directory.Packages.props": "nuget",
+}
+
+# Dependency file types read with the MSBuild parser
+MSBUILD_FILE_TYPES = {".csproj", "packages.config", "Directory.Packages.props"}
+
+# A PEP 508 requirement: name, optional extras, then a specifier or direct reference
+REQUIREMENT_PATTERN = re.compile(
+    r"^([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^\]]*\])?\s*([<>=!~(@].*)?$"
+)
+
+# An exact version pin such as ==2.31.0, wildcards like ==2.* are ranges
+EXACT_PIN_PATTERN = re.compile(r"^\(?\s*===?\s*([\w.+!-]+)\s*\)?$")
+
+# A bare Poetry version such as 2.31.0, which Poetry treats as an exact pin
+POETRY_PIN_PATTERN = re.compile(r"^(?:==)?\s*(\d[\w.+!-]*)$")
+
+
+def detect_manifest_type(filename: str) -> Optional[str]:
+    """Detect the dependency file type of a manifest from its filename
+
+    Args:
+        filename: The name of the file, without its directory
+
+    Returns:
+        The dependency file type, or None if the file is not a supported manifest
+    """
+    for pattern, file_type in MANIFEST_PATTERNS.items():
+        if fnmatch.fnmatch(filename.lower(), pattern):
+            return file_type
+    return None
+
+
+def parse_requirement(requirement: str) -> Optional[Tuple[str, Optional[str]]]:
+    """Split a PEP 508 requirement into its package name and pinned version
+
+    Args:
+        requirement: A requirement such as 'requests[socks]==2.31.0; python_version>"3.8"'
+
+    Returns:
+        A (package name, version) tuple with None unless the version is pinned
+        exactly, or None if the line is not a named requirement
+    """
+    # Environment markers do not change which package is required
+    requirement = requirement.split(";", 1)[0].strip()
+    match = REQUIREMENT_PATTERN.match(requirement)
+    if not match:
+        return None
+    name, specifier = match.group(1), (match.group(2) or "").strip()
+    pin = EXACT_PIN_PATTERN.match(specifier)
+    return name, pin.group(1) if pin else None
+
+
+def poetry_pinned_version(constraint: Optional[str]) -> Optional[str]:
+    """Return the exact version of a Poetry constraint, or None for ranges"""
+    if not isinstance(constraint, str):
+        return None
+    pin = POETRY_PIN_PATTERN.match(constraint.strip())
+    return pin.group(1) if pin else None
+
 
 class DependencyParser:
     """Class for parsing different types of dependency files"""
 
-    def parse_requirements_txt(self, content: str) -> List[str]:
-        """Parse a requirements.txt file and extract package names
+    def __init__(self, strict: bool = False):
+        """Initialize the parser
+
+        Args:
+            strict: Raise on malformed files instead of logging the error and
+                returning the packages that could be read
+        """
+        self.strict = strict
+
+    def parse_requirements_records(
+        self, content: str
+    ) -> List[Tuple[str, Optional[str]]]:
+        """Parse a requirements.txt file and extract package names with versions
+
+        Comments, pip options such as ``-r`` or ``--index-url``, and direct
+        references to paths or URLs are skipped.
 
         Args:
             content: The content of the requirements.txt file
 
         Returns:
-            A list of package names
+            A list of (package name, version) tuples, with None for unpinned versions
         """
         packages = []
-        lines = content.strip().split("\n")
+        # Join lines continued with a trailing backslash
+        content = re.sub(r"\\\r?\n", " ", content)
 
-        for line in lines:
-            # Skip comments and empty lines
-            if not line or line.startswith("#"):
+        for line in content.splitlines():
+            # Drop comments and per-requirement options such as --hash
+            line = re.split(r"(?:^|\s)#", line, maxsplit=1)[0]
+            line = re.split(r"\s--?[a-zA-Z]", line, maxsplit=1)[0].strip()
+            if not line or line.startswith("-"):
                 continue
-            if line.strip():
-                packages.append(line.strip())
+            record = parse_requirement(line)
+            if record:
+                packages.append(record)
 
         return packages
 
+    def parse_requirements_txt(self, content: str) -> List[str]:
+        """Parse a requirements.txt file and extract package names
+
+        Args:
+            content: The content of the requirements.txt file
+
+        Returns:
+            A list of package names
+        """
+        return [name for name, _ in self.parse_requirements_records(content)]
+
     def parse_package_json(self, content: str) -> List[str]:
         """Parse a package.json file and extract package names
 
@@ -50,44 +167,90 @@ class DependencyParser:
             packages.extend(list(dependencies.keys()))
             packages.extend(list(dev_dependencies.keys()))
 
-        except json.JSONDecodeError:
-            print("Error parsing package.json")
+        except json.JSONDecodeError as e:
+            if self.strict:
+                raise
+            logger.error(f"Error parsing package.json: {e}")
 
         return packages
 
-    def parse_pyproject_toml(self, content: str) -> List[str]:
-        """Parse a pyproject.toml file and extract package names
+    def parse_pyproject_records(self, content: str) -> List[Tuple[str, Optional[str]]]:
+        """Parse a pyproject.toml file and extract package names with versions
 
         Args:
             content: The content of the pyproject.toml file
 
         Returns:
-            A list of package names
+            A list of (package name, version) tuples, with None for unpinned versions
         """
         packages = []
         try:
             data = tomli.loads(content)
 
             # Extract dependencies from project section
-            project_deps = data.get("project", {}).get("dependencies", [])
-            if project_deps:
-                for dep in project_deps:
-                    # Extract package name (ignoring version specifiers)
-                    match = re.match(r"^([\w\-\.]+)", dep)
-                    if match:
-                        package_name = match.group(1)
-                        packages.append(package_name)
+            for dep in data.get("project", {}).get("dependencies", []):
+                record = parse_requirement(dep)
+                if record:
+                    packages.append(record)
 
             # Extract dependencies from tool.poetry section
             poetry_deps = data.get("tool", {}).get("poetry", {}).get("dependencies", {})
-            if poetry_deps:
-                packages.extend(list(poetry_deps.keys()))
+            for name, constraint in poetry_deps.items():
+                if name.lower() == "python":
+                    continue
+                if isinstance(constraint, dict):
+                    constraint = constraint.get("version")
+                packages.append((name, poetry_pinned_version(constraint)))
 
         except Exception as e:
-            print(f"Error parsing pyproject.toml: {e}")
+            if self.strict:
+                raise
+            logger.error(f"Error parsing pyproject.toml: {e}")
 
         return packages
 
+    def parse_pyproject_toml(self, content: str) -> List[str]:
+        """Parse a pyproject.toml file and extract package names
+
+        Args:
+            content: The content of the pyproject.toml file
+
+        Returns:
+            A list of package names
+        """
+        return [name for name, _ in self.parse_pyproject_records(content)]
+
+    def parse_msbuild(
+        self, content: str, central: Optional[MSBuildFile] = None
+    ) -> List[Tuple[str, Optional[str]]]:
+        """Parse an MSBuild project, packages.config or Directory.Packages.props file
+
+        Args:
+            content: The content of the file
+            central: The Directory.Packages.props that applies to a project
+
+        Returns:
+            A list of (package name, version) tuples, with None for unknown versions
+        """
+        # The content has already been decoded, so drop a conflicting encoding
+        # declaration before handing it to the XML parser as UTF-8
+        content = re.sub(r"^\s*<\?xml[^>]*\?>", "", content.lstrip("\ufeff"))
+        try:
+            return MSBuildParser().parse_project(
+                io.BytesIO(content.encode("utf-8")), central
+            )
+        except ET.ParseError as e:
+            if self.strict:
+                raise
+            logger.error(f"Error parsing MSBuild file: {e}")
+            # Fall back to scanning for package references in malformed files
+            return [
+                (name, None)
+                for name in re.findall(
+                    r'<PackageReference\s+Include="([^"]+)"', content
+                )
+            ]
+
     def parse_csproj(self, content: str) -> List[str]:
         """Parse a .csproj file and extract package names
 
@@ -97,13 +260,33 @@ class DependencyParser:
         Returns:
             A list of package names
         """
-        packages = []
+        return [name for name, _ in self.parse_msbuild(content)]
 
-        # Look for PackageReference elements
-        package_refs = re.findall(r'<PackageReference\s+Include="([^"]+)"', content)
-        packages.extend(package_refs)
+    def parse_dependency_records(
+        self, content: str, file_type: str
+    ) -> List[Tuple[str, Optional[str]]]:
+        """Parse a dependency file and extract package names with their versions
 
-        return packages
+        Versions are reported for exact pins only; ranges and package.json
+        dependencies report None as the version.
+
+        Args:
+            content: The content of the dependency file
+            file_type: The type of dependency file ('requirements.txt', '.csproj', etc.)
+
+        Returns:
+            A list of (package name, version) tuples
+        """
+        if file_type in MSBUILD_FILE_TYPES:
+            return self.parse_msbuild(content)
+        if file_type == "requirements.txt":
+            return self.parse_requirements_records(content)
+        if file_type == "pyproject.toml":
+            return self.parse_pyproject_records(content)
+        return [
+            (package, None)
+            for package in self.parse_dependency_file(content, file_type)
+        ]
 
     def parse_dependency_file(self, content: str, file_type: str) -> List[str]:
         """Parse a dependency file and extract package names
@@ -121,7 +304,7 @@ class DependencyParser:
             return self.parse_package_json(content)
         elif file_type == "pyproject.toml":
             return self.parse_pyproject_toml(content)
-        elif file_type == ".csproj":
-            return self.parse_csproj(content)
+        elif file_type in MSBUILD_FILE_TYPES:
+            return [name for name, _ in self.parse_msbuild(content)]
         else:
             raise ValueError(f"Unsupported file type: {file_type}")
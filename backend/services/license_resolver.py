@@ -0,0 +1,164 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.schemas.schemas import LicenseInfo
+from backend.utils.logger_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Number of concurrent license lookups, which are bound by registry I/O
+DEFAULT_RESOLVE_WORKERS = 16
+
+
+class LicenseResolver:
+    """Resolve package licenses through the license analyzer
+
+    Concurrent requests for the same (ecosystem, package, version) share one
+    in-flight lookup. Finished lookups are not kept, so memory stays bounded by
+    the lookups in flight; repeated lookups are served by the registry cache.
+    """
+
+    def __init__(
+        self, analyzer: Optional[Any] = None, max_workers: int = DEFAULT_RESOLVE_WORKERS
+    ):
+        """Initialize the resolver
+
+        Args:
+            analyzer: The license analyzer to use, created on first lookup if omitted
+            max_workers: The number of concurrent license lookups
+        """
+        self.analyzer = analyzer
+        self.lookups = 0
+        self.hits = 0
+        self._lookups: Dict[Tuple[str, str, Optional[str]], Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="license-resolver"
+        )
+
+    def get_analyzer(self) -> Any:
+        """Return the license analyzer, creating it on first use
+
+        Raises:
+            Exception: If the analyzer cannot be created, e.g. without API keys
+        """
+        with self._lock:
+            if self.analyzer is None:
+                from backend.models.license_analyzer import LicenseAnalyzer
+
+                self.analyzer = LicenseAnalyzer()
+            return self.analyzer
+
+    def _lookup(
+        self, package_name: str, ecosystem: str, version: Optional[str]
+    ) -> Dict[str, Any]:
+        try:
+            license_info: Dict[str, Any] = self.get_analyzer().get_package_license(
+                package_name, ecosystem, version
+            )
+            return license_info
+        except Exception as e:
+            logger.warning(f"Error resolving license for {package_name}: {str(e)}")
+            return {"license_type": "Unknown"}
+
+    def submit(
+        self, package_name: str, ecosystem: str, version: Optional[str] = None
+    ) -> Future:
+        """Start the license lookup of a package unless it is already in flight
+
+        Args:
+            package_name: The name of the package
+            ecosystem: The package ecosystem (python, npm, etc.)
+            version: The exact version of the package, or None for the latest
+
+        Returns:
+            A future for the license information of the package
+        """
+        key = (ecosystem, package_name, version)
+        with self._lock:
+            future = self._lookups.get(key)
+            if future is not None:
+                self.hits += 1
+                return future
+            self.lookups += 1
+            future = self._executor.submit(
+                self._lookup, package_name, ecosystem, version
+            )
+            self._lookups[key] = future
+        # Added outside the lock, since it runs right away if the lookup is done
+        future.add_done_callback(lambda done: self._forget(key, done))
+        return future
+
+    def _forget(self, key: Tuple[str, str, Optional[str]], future: Future) -> None:
+        with self._lock:
+            if self._lookups.get(key) is future:
+                del self._lookups[key]
+
+    def resolve_async(
+        self, packages: List[Tuple[str, Optional[str]]], ecosystem: str
+    ) -> "Future[List[LicenseInfo]]":
+        """Start resolving the licenses of packages without waiting for them
+
+        Args:
+            packages: (name, version) tuples of the packages, version may be None
+            ecosystem: The package ecosystem (python, npm, etc.)
+
+        Returns:
+            A future for the license information of each package, in the given
+            order, which completes once all of their lookups have finished
+        """
+        futures = [
+            self.submit(package, ecosystem, version) for package, version in packages
+        ]
+        result: "Future[List[LicenseInfo]]" = Future()
+        remaining = [len(futures)]
+        lock = threading.Lock()
+
+        def complete() -> None:
+            try:
+                result.set_result(
+                    [
+                        LicenseInfo(
+                            **{
+                                **future.result(),
+                                "package_name": package,
+                                "version": version,
+                            }
+                        )
+                        for (package, version), future in zip(packages, futures)
+                    ]
+                )
+            except Exception as e:
+                result.set_exception(e)
+
+        def on_done(_: Future) -> None:
+            with lock:
+                remaining[0] -= 1
+                finished = remaining[0] == 0
+            if finished:
+                complete()
+
+        if not futures:
+            complete()
+        for future in futures:
+            future.add_done_callback(on_done)
+        return result
+
+    def resolve(
+        self, packages: List[Tuple[str, Optional[str]]], ecosystem: str
+    ) -> List[LicenseInfo]:
+        """Resolve the licenses of packages
+
+        Args:
+            packages: (name, version) tuples of the packages, version may be None
+            ecosystem: The package ecosystem (python, npm, etc.)
+
+        Returns:
+            The license information of each package, in the given order
+        """
+        return self.resolve_async(packages, ecosystem).result()
+
+    def close(self) -> None:
+        """Stop the lookup workers"""
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,378 @@
+import os
+import re
+import xml.etree.ElementTree as ET
+from typing import IO, Dict, Iterator, List, Optional, Tuple, Union
+
+from backend.utils.logger_utils import get_logger
+
+logger = get_logger(__name__)
+
+# A NuGet package reference as (package id, version or None)
+PackageRecord = Tuple[str, Optional[str]]
+
+# A path to an MSBuild file or a binary file object
+Source = Union[str, IO[bytes]]
+
+CENTRAL_PACKAGES_FILE = "Directory.Packages.props"
+PACKAGES_CONFIG_FILE = "packages.config"
+
+# Files MSBuild imports into every project below them
+DIRECTORY_BUILD_FILES = ("Directory.Build.props", "Directory.Build.targets")
+
+PROJECT_EXTENSIONS = (".csproj", ".fsproj", ".vbproj")
+
+# Items that reference or pin NuGet packages
+PACKAGE_ITEMS = ("PackageReference", "PackageVersion", "GlobalPackageReference")
+
+# Item metadata that may be written as child elements instead of attributes
+VERSION_METADATA = ("Version", "VersionOverride")
+
+# Directories that never contain projects of the solution itself
+SKIPPED_DIRS = {".git", ".vs", "bin", "obj", "node_modules", "packages"}
+
+PROPERTY_PATTERN = re.compile(r"\$\(([\w.]+)\)")
+
+
+def _local_name(tag: str) -> str:
+    """Strip the namespace of old-style MSBuild elements"""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _expand(value: Optional[str], properties: Dict[str, str]) -> Optional[str]:
+    """Expand $(Property) references and drop versions that cannot be resolved"""
+    if value is None:
+        return None
+    value = PROPERTY_PATTERN.sub(
+        lambda match: properties.get(match.group(1), match.group(0)), value.strip()
+    )
+    if not value or "$(" in value:
+        return None
+    return value
+
+
+def _split_items(value: Optional[str]) -> List[str]:
+    """Split a semicolon-separated Include/Update attribute into package ids"""
+    return [name.strip() for name in (value or "").split(";") if name.strip()]
+
+
+class MSBuildFile:
+    """Package items and properties read from one MSBuild file
+
+    Items are keyed by lower-cased package id, since NuGet ids are
+    case-insensitive.
+    """
+
+    def __init__(self) -> None:
+        self.includes: Dict[str, PackageRecord] = {}
+        self.updates: Dict[str, PackageRecord] = {}
+        self.central_versions: Dict[str, PackageRecord] = {}
+        self.global_references: Dict[str, PackageRecord] = {}
+        self.properties: Dict[str, str] = {}
+
+
+class MSBuildImports:
+    """The Directory.* files MSBuild imports into the projects of a directory"""
+
+    def __init__(
+        self,
+        central: Optional[MSBuildFile],
+        imported: List[MSBuildFile],
+        properties: Dict[str, str],
+    ) -> None:
+        self.central = central
+        self.imported = imported
+        self.properties = properties
+
+
+class MSBuildParser:
+    """Incremental parser for MSBuild projects and NuGet package manifests
+
+    Files are read with ``iterparse`` and every element is dropped once handled,
+    so memory stays bounded by the number of distinct packages rather than the
+    size of the files. Versions of ``PackageReference`` items are resolved from
+    ``Version``/``VersionOverride`` attributes or child elements, ``Update`` items
+    and central package management in ``Directory.Packages.props``.
+
+    Imported Directory.* files are read once per parser and shared by every
+    project below them, so reuse one parser for the projects of a tree.
+    """
+
+    def __init__(self) -> None:
+        self._nearest: Dict[Tuple[str, str], Optional[str]] = {}
+        self._imports: Dict[Tuple[Optional[str], ...], MSBuildImports] = {}
+
+    def read(
+        self, source: Source, properties: Optional[Dict[str, str]] = None
+    ) -> MSBuildFile:
+        """Read the package items and properties of an MSBuild file
+
+        Args:
+            source: The path or binary file object of the MSBuild file
+            properties: Properties inherited from imported files
+
+        Returns:
+            The package items and properties of the file
+        """
+        result = MSBuildFile()
+        result.properties.update(properties or {})
+        stack: List[ET.Element] = []
+
+        for event, elem in ET.iterparse(source, events=("start", "end")):
+            if event == "start":
+                stack.append(elem)
+                continue
+
+            stack.pop()
+            tag = _local_name(elem.tag)
+            parent = _local_name(stack[-1].tag) if stack else None
+
+            if parent == "PropertyGroup":
+                text = (elem.text or "").strip()
+                if text:
+                    result.properties[tag] = _expand(text, result.properties) or text
+            elif tag in PACKAGE_ITEMS:
+                self._read_item(tag, elem, result)
+            elif tag == "package":
+                # packages.config entries
+                package_id = (elem.get("id") or "").strip()
+                if package_id:
+                    result.includes[package_id.lower()] = (
+                        package_id,
+                        _expand(elem.get("version"), result.properties),
+                    )
+            elif tag in VERSION_METADATA and parent in PACKAGE_ITEMS:
+                # Read by the enclosing item when it ends
+                continue
+
+            elem.clear()
+            if stack:
+                stack[-1].remove(elem)
+
+        return result
+
+    def _read_item(self, tag: str, elem: ET.Element, result: MSBuildFile) -> None:
+        metadata = {name: elem.get(name) for name in VERSION_METADATA}
+        for child in elem:
+            name = _local_name(child.tag)
+            if name in VERSION_METADATA and child.text:
+                metadata[name] = child.text
+        version = _expand(
+            metadata["VersionOverride"] or metadata["Version"], result.properties
+        )
+
+        if tag == "PackageVersion":
+            for name in _split_items(elem.get("Include") or elem.get("Update")):
+                if version:
+                    result.central_versions[name.lower()] = (name, version)
+            return
+
+        target = (
+            result.global_references
+            if tag == "GlobalPackageReference"
+            else result.includes
+        )
+        for name in _split_items(elem.get("Include")):
+            target[name.lower()] = (name, version)
+        for name in _split_items(elem.get("Update")):
+            result.updates[name.lower()] = (name, version)
+
+    def resolve(
+        self,
+        project: MSBuildFile,
+        central: Optional[MSBuildFile] = None,
+        imported: Optional[List[MSBuildFile]] = None,
+    ) -> List[PackageRecord]:
+        """Resolve the package references of a project to (name, version) records
+
+        A version on the reference itself wins over a version set by an ``Update``
+        item, which wins over the centrally managed version. ``Update`` items
+        without a matching ``Include`` do nothing, as in MSBuild, and central
+        versions only apply when ``ManagePackageVersionsCentrally`` is true.
+
+        Args:
+            project: The project, or a packages.config file
+            central: The Directory.Packages.props that applies to the project
+            imported: Directory.Build.props/targets files imported by the project
+
+        Returns:
+            One record per distinct package id referenced by the project
+        """
+        includes: Dict[str, PackageRecord] = {}
+        updates: Dict[str, PackageRecord] = {}
+        for source in [*(imported or []), project]:
+            includes.update(source.includes)
+            updates.update(
+                {key: record for key, record in source.updates.items() if record[1]}
+            )
+        managed = (
+            project.properties.get("ManagePackageVersionsCentrally", "").lower()
+            == "true"
+        )
+        central = central if managed else None
+
+        records: Dict[str, PackageRecord] = {}
+        if central:
+            records.update(central.global_references)
+        for key, (name, version) in includes.items():
+            version = (
+                version
+                or updates.get(key, (name, None))[1]
+                or (
+                    central.central_versions.get(key, (name, None))[1]
+                    if central
+                    else None
+                )
+            )
+            records[key] = (name, version)
+        return list(records.values())
+
+    def parse_project(
+        self, source: Source, central: Optional[MSBuildFile] = None
+    ) -> List[PackageRecord]:
+        """Parse a single project, packages.config or Directory.Packages.props
+
+        Args:
+            source: The path or binary file object of the file
+            central: The Directory.Packages.props that applies to the project
+
+        Returns:
+            One record per distinct package id referenced by the file
+        """
+        project = self.read(source, central.properties if central else None)
+        if not project.includes and (
+            project.central_versions or project.global_references
+        ):
+            # A Directory.Packages.props on its own lists the packages it manages
+            records = dict(project.central_versions)
+            records.update(project.global_references)
+            return list(records.values())
+        return self.resolve(project, central)
+
+    def read_imports(self, path: str) -> MSBuildImports:
+        """Read the Directory.* files MSBuild imports into a project
+
+        Directory.Build.props and then Directory.Packages.props are imported
+        before the project body, Directory.Build.targets after it; only the
+        nearest file of each kind above the project applies.
+
+        Args:
+            path: The path of the project file
+
+        Returns:
+            The central package versions, the imported build files and the
+            properties they define
+        """
+        build_props, central_path, build_targets = (
+            self.find_nearest(path, name)
+            for name in (
+                DIRECTORY_BUILD_FILES[0],
+                CENTRAL_PACKAGES_FILE,
+                DIRECTORY_BUILD_FILES[1],
+            )
+        )
+        key = (build_props, central_path, build_targets)
+        imports = self._imports.get(key)
+        if imports is not None:
+            return imports
+
+        imported: List[MSBuildFile] = []
+        properties: Dict[str, str] = {}
+        if build_props:
+            imported.append(self.read(build_props))
+            properties = imported[-1].properties
+        central = self.read(central_path, properties) if central_path else None
+        if central:
+            properties = central.properties
+        if build_targets:
+            imported.append(self.read(build_targets, properties))
+
+        imports = self._imports[key] = MSBuildImports(central, imported, properties)
+        return imports
+
+    def parse_project_file(self, path: str) -> List[PackageRecord]:
+        """Parse a project or packages.config on disk with the files it imports
+
+        Args:
+            path: The path of the project, packages.config or
+                Directory.Packages.props file
+
+        Returns:
+            One record per distinct package id referenced by the file
+        """
+        filename = os.path.basename(path).lower()
+        if filename == PACKAGES_CONFIG_FILE:
+            # packages.config predates central package management
+            return self.resolve(self.read(path))
+        if filename == CENTRAL_PACKAGES_FILE.lower():
+            return self.parse_project(path)
+
+        imports = self.read_imports(path)
+        project = self.read(path, imports.properties)
+        return self.resolve(project, imports.central, imports.imported)
+
+    def parse_solution(self, root: str) -> Iterator[Tuple[str, List[PackageRecord]]]:
+        """Parse every project of a solution directory tree in one pass
+
+        Each project is resolved against the nearest Directory.Packages.props and
+        Directory.Build.props/targets above it, which are read once and shared by
+        all projects below them.
+
+        Args:
+            root: The root directory of the solution
+
+        Yields:
+            Tuples of (project path, package records of the project)
+        """
+        for directory, dirs, files in os.walk(os.path.abspath(root)):
+            dirs[:] = sorted(name for name in dirs if name not in SKIPPED_DIRS)
+            for filename in sorted(files):
+                if not (
+                    filename.lower().endswith(PROJECT_EXTENSIONS)
+                    or filename.lower() == PACKAGES_CONFIG_FILE
+                ):
+                    continue
+                path = os.path.join(directory, filename)
+                try:
+                    yield path, self.parse_project_file(path)
+                except ET.ParseError as e:
+                    logger.error(f"Error parsing {path}: {e}")
+
+    def find_nearest(self, path: str, filename: str) -> Optional[str]:
+        """Find the nearest file with a given name in or above a project's directory
+
+        Args:
+            path: The path of a project file
+            filename: The name of the file to look for, e.g. Directory.Build.props
+
+        Returns:
+            The path of the nearest file with that name, or None
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        visited = []
+        found = None
+        while (directory, filename) not in self._nearest:
+            visited.append(directory)
+            candidate = os.path.join(directory, filename)
+            if os.path.isfile(candidate):
+                found = candidate
+                break
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                break
+            directory = parent
+        else:
+            found = self._nearest[(directory, filename)]
+        for directory in visited:
+            self._nearest[(directory, filename)] = found
+        return found
+
+    def find_central_packages(self, path: str) -> Optional[str]:
+        """Find the Directory.Packages.props that applies to a project
+
+        Args:
+            path: The path of a project file
+
+        Returns:
+            The path of the nearest Directory.Packages.props above it, or None
+        """
+        return self.find_nearest(path, CENTRAL_PACKAGES_FILE)
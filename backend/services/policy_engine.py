@@ -0,0 +1,258 @@
+from typing import Dict, Iterable, List, Literal, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.schemas.schemas import (
+    TERM_CATEGORIES,
+    LicenseInfo,
+    LicensePolicy,
+    PolicyEvaluation,
+    PolicySummary,
+    PolicyVerdict,
+)
+from backend.services.spdx import license_id_matches, license_ids
+
+# Terms produced by the license analysis, following the choosealicense.com rules
+BASE_VOCABULARY = [
+    "permissions:commercial-use",
+    "permissions:modification",
+    "permissions:distribution",
+    "permissions:private-use",
+    "permissions:patent-use",
+    "limitations:liability",
+    "limitations:warranty",
+    "limitations:trademark-use",
+    "limitations:patent-use",
+    "obligations:license-notice",
+    "obligations:copyright-notice",
+    "obligations:state-changes",
+    "obligations:disclose-source",
+    "obligations:network-use-disclose",
+    "obligations:same-license",
+    "obligations:document-changes",
+]
+
+VERDICTS: Tuple[Literal["allow", "flag", "deny"], ...] = ("allow", "flag", "deny")
+
+UNKNOWN_LICENSES = {"", "UNKNOWN", "NOASSERTION", "NONE"}
+
+DEFAULT_POLICY = LicensePolicy(
+    name="default",
+    deny_licenses=["AGPL-1.0", "AGPL-3.0"],
+    flag_terms=["obligations:license-notice", "obligations:copyright-notice"],
+    flag_missing_terms=["permissions:commercial-use"],
+)
+
+
+def normalize_term(term: str) -> str:
+    """Normalize a free-text license term, e.g. 'Commercial use' -> 'commercial-use'"""
+    return "-".join(term.strip().lower().replace("_", " ").split())
+
+
+def normalize_license(license_type: Optional[str]) -> str:
+    """Normalize a license identifier for case-insensitive matching"""
+    return (license_type or "").strip().upper()
+
+
+class PolicyEngine:
+    """Evaluate license reports against a policy compiled into packed bitmasks
+
+    Every term the policy refers to gets a bit position. Packages are packed into
+    a (n_packages, n_bytes) uint8 matrix so a whole report is checked with a few
+    vectorized operations instead of per-package list scans.
+    """
+
+    def __init__(self, policy: LicensePolicy):
+        """Compile a policy into bitmasks
+
+        Args:
+            policy: The policy to compile
+        """
+        self.policy = policy
+        self.vocabulary: Dict[str, int] = {}
+        for term in BASE_VOCABULARY:
+            self._index(term)
+
+        deny_bits = self._compile(policy.deny_terms)
+        require_bits = self._compile(policy.require_terms)
+        flag_bits = self._compile(policy.flag_terms)
+        flag_missing_bits = self._compile(policy.flag_missing_terms)
+
+        # The vocabulary is complete, so the masks can be packed to their final width
+        self.terms = list(self.vocabulary)
+        self.deny_mask = self._mask(deny_bits)
+        self.require_mask = self._mask(require_bits)
+        self.flag_mask = self._mask(flag_bits)
+        self.flag_missing_mask = self._mask(flag_missing_bits)
+        # Denied licenses given as SPDX ids match whole ids, anything else must
+        # match the license type exactly
+        self.deny_license_ids = set()
+        self.deny_license_names = set()
+        for name in policy.deny_licenses:
+            ids = license_ids(name, deprecated=False)
+            if ids:
+                self.deny_license_ids.update(ids)
+            else:
+                self.deny_license_names.add(normalize_license(name))
+
+    def _index(self, term: str) -> int:
+        """Return the bit position of a term, assigning a new one if needed"""
+        category, _, name = term.partition(":")
+        key = f"{category.strip().lower()}:{normalize_term(name)}"
+        if key not in self.vocabulary:
+            self.vocabulary[key] = len(self.vocabulary)
+        return self.vocabulary[key]
+
+    def _compile(self, terms: Iterable[str]) -> List[int]:
+        """Assign bit positions to the terms of one policy rule"""
+        return [self._index(term) for term in terms]
+
+    def _pack(self, rows: List[int], cols: List[int], n_rows: int) -> np.ndarray:
+        """Pack (row, bit) pairs into a (n_rows, n_bytes) bitset matrix"""
+        dense = np.zeros((n_rows, len(self.vocabulary)), dtype=bool)
+        dense[rows, cols] = True
+        return np.packbits(dense, axis=1)
+
+    def _mask(self, bits: List[int]) -> np.ndarray:
+        """Pack the bit positions of one rule into a single-row mask"""
+        return self._pack([0] * len(bits), bits, 1)
+
+    def _license_denied(self, license_type: str) -> bool:
+        """Check whether any license of an SPDX expression or name is denied"""
+        if license_type in self.deny_license_names:
+            return True
+        return any(
+            license_id_matches(license_id, rule)
+            for license_id in license_ids(license_type)
+            for rule in self.deny_license_ids
+        )
+
+    def pack_packages(self, packages: Sequence[LicenseInfo]) -> np.ndarray:
+        """Pack the terms of each package into a bit vector
+
+        Terms the policy does not know about cannot affect a verdict and are skipped.
+
+        Args:
+            packages: The packages to pack
+
+        Returns:
+            A (n_packages, n_bytes) uint8 matrix of packed term bits
+        """
+        rows: List[int] = []
+        cols: List[int] = []
+        for row, package in enumerate(packages):
+            for category in TERM_CATEGORIES:
+                for term in getattr(package, category) or []:
+                    col = self.vocabulary.get(f"{category}:{normalize_term(term)}")
+                    if col is not None:
+                        rows.append(row)
+                        cols.append(col)
+        return self._pack(rows, cols, len(packages))
+
+    def evaluate(self, packages: Sequence[LicenseInfo]) -> PolicyEvaluation:
+        """Evaluate packages against the compiled policy
+
+        Args:
+            packages: The packages of a license report
+
+        Returns:
+            Per-package verdicts with reasons, and a summary of the verdict counts
+        """
+        bits = self.pack_packages(packages)
+
+        # License types repeat heavily, so match each distinct one only once
+        license_codes: Dict[str, int] = {}
+        codes = np.fromiter(
+            (
+                license_codes.setdefault(
+                    normalize_license(package.license_type), len(license_codes)
+                )
+                for package in packages
+            ),
+            dtype=np.intp,
+            count=len(packages),
+        )
+        license_types = list(license_codes)
+        license_denied = np.array(
+            [self._license_denied(name) for name in license_types], dtype=bool
+        )[codes]
+        license_unknown = np.array(
+            [name in UNKNOWN_LICENSES for name in license_types], dtype=bool
+        )[codes]
+
+        # Packages resolved from registry metadata alone carry no terms, so a
+        # term can only be missing from packages whose license was analyzed
+        analyzed = np.fromiter(
+            (
+                any(getattr(package, category) for category in TERM_CATEGORIES)
+                for package in packages
+            ),
+            dtype=bool,
+            count=len(packages),
+        )
+        analyzed_mask = np.where(analyzed, 0xFF, 0).astype(np.uint8)[:, None]
+
+        present = {"deny": bits & self.deny_mask, "flag": bits & self.flag_mask}
+        missing = {
+            "deny": ~bits & self.require_mask & analyzed_mask,
+            "flag": ~bits & self.flag_missing_mask & analyzed_mask,
+        }
+
+        denied = (
+            license_denied | present["deny"].any(axis=1) | missing["deny"].any(axis=1)
+        )
+        flagged = present["flag"].any(axis=1) | missing["flag"].any(axis=1)
+        if self.policy.flag_unknown_license:
+            flagged |= license_unknown
+        verdicts = np.where(denied, 2, np.where(flagged, 1, 0))
+
+        reasons: List[List[str]] = [[] for _ in range(len(packages))]
+        for row in np.flatnonzero(license_denied):
+            reasons[row].append(f"license denied: {packages[int(row)].license_type}")
+        if self.policy.flag_unknown_license:
+            for row in np.flatnonzero(license_unknown):
+                reasons[row].append("license unknown")
+        width = len(self.terms)
+        for verdict, hits, label in (
+            ("deny", present, "denied term"),
+            ("deny", missing, "missing required term"),
+            ("flag", present, "flagged term"),
+            ("flag", missing, "missing term"),
+        ):
+            matrix = np.unpackbits(hits[verdict], axis=1, count=width)
+            for row, col in zip(*np.nonzero(matrix)):
+                reasons[row].append(f"{label}: {self.terms[col]}")
+
+        counts = np.bincount(verdicts, minlength=len(VERDICTS))
+        return PolicyEvaluation(
+            policy_name=self.policy.name,
+            verdicts=[
+                PolicyVerdict(
+                    package_name=package.package_name,
+                    verdict=VERDICTS[verdict],
+                    reasons=reasons[row],
+                )
+                for row, (package, verdict) in enumerate(zip(packages, verdicts))
+            ],
+            summary=PolicySummary(
+                total=len(packages),
+                allowed=int(counts[0]),
+                flagged=int(counts[1]),
+                denied=int(counts[2]),
+            ),
+        )
+
+
+def evaluate_policy(
+    packages: Sequence[LicenseInfo], policy: LicensePolicy = DEFAULT_POLICY
+) -> PolicyEvaluation:
+    """Evaluate packages against a policy
+
+    Args:
+        packages: The packages of a license report
+        policy: The policy to apply, defaults to the organisation policy
+
+    Returns:
+        The policy evaluation for the packages
+    """
+    return PolicyEngine(policy).evaluate(packages)
@@ -0,0 +1,317 @@
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+
+from backend.config import settings
+from backend.utils.logger_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Versions that pin an exact, immutable release
+PINNED_VERSION = re.compile(r"^\d[\w.+-]*$")
+
+# npm treats partial versions such as 1.2 as ranges, only full semver is exact
+NPM_PINNED_VERSION = re.compile(r"^\d+\.\d+\.\d+(?:[-+][\w.+-]*)?$")
+
+# Wildcard segments of x-ranges such as 1.x, 2.X or 1.*
+WILDCARD_SEGMENT = re.compile(r"(?:^|[.])[xX*](?:$|[.+-])")
+
+# Registry responses that mean the package will not resolve for us
+NEGATIVE_STATUSES = {401, 403, 404, 410}
+
+CacheKey = Tuple[str, str, Optional[str]]
+
+
+def normalize_nuget_version(version: str) -> str:
+    """Normalize a NuGet version the way the flat container addresses it
+
+    Build metadata is dropped, the version is padded to three parts and a zero
+    fourth part is removed, e.g. 1.0 -> 1.0.0 and 1.2.3.0+abc -> 1.2.3.
+    """
+    version = version.split("+", 1)[0]
+    release, separator, prerelease = version.partition("-")
+    parts = [str(int(part)) if part.isdigit() else part for part in release.split(".")]
+    parts += ["0"] * (3 - len(parts))
+    if len(parts) == 4 and parts[3] == "0":
+        parts.pop()
+    return ".".join(parts) + separator + prerelease
+
+
+def pinned_version(version: Optional[str], ecosystem: str = "python") -> Optional[str]:
+    """Return the exact version of a release, or None for latest/ranges
+
+    Args:
+        version: The version or version constraint of a package
+        ecosystem: The package ecosystem (python, npm, nuget)
+
+    Returns:
+        The exact version, normalized for the registry, or None
+    """
+    version = (version or "").strip()
+    if version.startswith("=="):
+        version = version[2:].strip()
+    if version.startswith("[") and version.endswith("]") and "," not in version:
+        # NuGet exact version notation, e.g. [1.2.3]
+        version = version[1:-1].strip()
+    if version[:1] in ("v", "V"):
+        version = version[1:]
+    if not PINNED_VERSION.match(version) or WILDCARD_SEGMENT.search(version):
+        return None
+    if ecosystem == "npm" and not NPM_PINNED_VERSION.match(version):
+        return None
+    if ecosystem == "nuget":
+        return normalize_nuget_version(version)
+    return version
+
+
+class CacheEntry:
+    """Cached registry metadata of one (ecosystem, package, version)"""
+
+    def __init__(
+        self,
+        metadata: Optional[Dict[str, Any]],
+        expires_at: Optional[float],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        self.metadata = metadata
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def negative(self) -> bool:
+        return self.metadata is None
+
+    def is_fresh(self) -> bool:
+        return self.expires_at is None or time.monotonic() < self.expires_at
+
+
+class RegistryClient:
+    """Fetch package metadata from PyPI, npm and NuGet with version-aware caching
+
+    Metadata of exact released versions never expires, since releases are
+    immutable. Latest or unpinned lookups are cached for a TTL and then
+    revalidated with ETag/If-Modified-Since instead of refetched. Packages that
+    are not found or private are cached negatively for a short time, so typos
+    and internal packages do not hit the registries on every scan.
+    """
+
+    def __init__(
+        self,
+        latest_ttl: float = settings.REGISTRY_LATEST_TTL,
+        negative_ttl: float = settings.REGISTRY_NEGATIVE_TTL,
+        max_entries: int = settings.REGISTRY_CACHE_SIZE,
+        timeout: float = settings.REGISTRY_TIMEOUT,
+    ):
+        """Initialize the registry client
+
+        Args:
+            latest_ttl: Seconds before latest/unpinned metadata is revalidated
+            negative_ttl: Seconds a not-found or private package is remembered
+            max_entries: The number of cache entries kept before evicting the oldest
+            timeout: Seconds before a registry request times out
+        """
+        self.latest_ttl = latest_ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._cache: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stats = {
+            "hits": 0,
+            "negative_hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "stale_served": 0,
+        }
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers["User-Agent"] = "licenSage"
+            self._local.session = session
+        return session
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _get(self, key: CacheKey) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+            return entry
+
+    def _put(self, key: CacheKey, entry: CacheEntry) -> None:
+        with self._lock:
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def get_metadata(
+        self, package_name: str, ecosystem: str, version: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get the license metadata of a package from its registry
+
+        Args:
+            package_name: The name of the package
+            ecosystem: The package ecosystem (python, npm, nuget)
+            version: The version of the package, or None for the latest
+
+        Returns:
+            A dictionary with the 'license' and resolved 'version' of the package,
+            or None if the package cannot be found
+        """
+        pinned = pinned_version(version, ecosystem)
+        key = (ecosystem, package_name.lower(), pinned)
+        entry = self._get(key)
+        if entry is not None and entry.is_fresh():
+            self._count("negative_hits" if entry.negative else "hits")
+            return entry.metadata
+        self._count("misses")
+
+        try:
+            return self._fetch(key, package_name, ecosystem, pinned, entry)
+        except (requests.RequestException, ValueError, ET.ParseError) as e:
+            logger.warning(
+                f"Error fetching {ecosystem} metadata for {package_name}: {e}"
+            )
+            if entry is not None and not entry.negative:
+                # Serve stale metadata while the registry is unavailable
+                self._count("stale_served")
+                entry.expires_at = time.monotonic() + self.negative_ttl
+                return entry.metadata
+            return None
+
+    def _fetch(
+        self,
+        key: CacheKey,
+        package_name: str,
+        ecosystem: str,
+        version: Optional[str],
+        stale: Optional[CacheEntry],
+    ) -> Optional[Dict[str, Any]]:
+        url = self._metadata_url(package_name, ecosystem, version)
+        if url is None:
+            return None
+
+        headers = {}
+        if stale is not None and not stale.negative:
+            if stale.etag:
+                headers["If-None-Match"] = stale.etag
+            if stale.last_modified:
+                headers["If-Modified-Since"] = stale.last_modified
+        response = self._session().get(url, headers=headers, timeout=self.timeout)
+        expires_at = None if version else time.monotonic() + self.latest_ttl
+
+        if response.status_code == 304 and stale is not None:
+            self._count("revalidated")
+            stale.expires_at = expires_at
+            self._put(key, stale)
+            return stale.metadata
+        if response.status_code in NEGATIVE_STATUSES:
+            self._put(key, CacheEntry(None, time.monotonic() + self.negative_ttl))
+            return None
+        response.raise_for_status()
+
+        metadata = self._parse(package_name, ecosystem, version, response)
+        if metadata is None:
+            self._put(key, CacheEntry(None, time.monotonic() + self.negative_ttl))
+            return None
+        self._put(
+            key,
+            CacheEntry(
+                metadata,
+                expires_at,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+            ),
+        )
+        return metadata
+
+    def _metadata_url(
+        self, package_name: str, ecosystem: str, version: Optional[str]
+    ) -> Optional[str]:
+        if ecosystem == "python":
+            if version:
+                return f"https://pypi.org/pypi/{package_name}/{version}/json"
+            return f"https://pypi.org/pypi/{package_name}/json"
+        if ecosystem == "npm":
+            # Scoped packages are addressed as @scope%2Fname
+            package_id = package_name.replace("/", "%2F")
+            return f"https://registry.npmjs.org/{package_id}/{version or 'latest'}"
+        if ecosystem == "nuget":
+            package_id = package_name.lower()
+            if version:
+                return (
+                    "https://api.nuget.org/v3-flatcontainer/"
+                    f"{package_id}/{version.lower()}/{package_id}.nuspec"
+                )
+            return f"https://api.nuget.org/v3-flatcontainer/{package_id}/index.json"
+        return None
+
+    def _parse(
+        self,
+        package_name: str,
+        ecosystem: str,
+        version: Optional[str],
+        response: requests.Response,
+    ) -> Optional[Dict[str, Any]]:
+        if ecosystem == "python":
+            info = response.json().get("info", {})
+            license_type = info.get("license_expression") or info.get("license")
+            if not license_type or len(license_type) > 100:
+                # Some projects paste the whole license text, use the classifier
+                classifiers = [
+                    classifier.split(" :: ")[-1]
+                    for classifier in info.get("classifiers", [])
+                    if classifier.startswith("License ::")
+                ]
+                license_type = classifiers[0] if classifiers else None
+            return {"license": license_type, "version": info.get("version")}
+
+        if ecosystem == "npm":
+            data = response.json()
+            license_type = data.get("license")
+            if isinstance(license_type, dict):
+                license_type = license_type.get("type")
+            return {"license": license_type, "version": data.get("version")}
+
+        if version is None:
+            # The NuGet index only lists versions, resolve the latest release
+            versions = response.json().get("versions", [])
+            releases = [release for release in versions if "-" not in release]
+            if not (releases or versions):
+                return None
+            return self.get_metadata(
+                package_name, ecosystem, (releases or versions)[-1]
+            )
+
+        root = ET.fromstring(response.content)
+        license_type = None
+        for elem in root.iter():
+            tag = elem.tag.rsplit("}", 1)[-1]
+            if tag == "license" and elem.text and elem.get("type") != "file":
+                license_type = elem.text.strip()
+            elif tag == "licenseUrl" and elem.text and not license_type:
+                license_type = elem.text.strip()
+        return {"license": license_type, "version": version}
+
+    def stats(self) -> Dict[str, int]:
+        """Cache hit, miss and revalidation counters"""
+        with self._lock:
+            return {**self._stats, "entries": len(self._cache)}
+
+
+# Create registry client instance
+registry_client = RegistryClient()
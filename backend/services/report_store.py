@@ -0,0 +1,65 @@
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+from backend.schemas.schemas import LicenseReport
+
+# Number of reports kept for re-evaluation before the oldest are evicted
+MAX_STORED_REPORTS = 256
+
+
+class ReportStore:
+    """In-memory LRU store of analyzed reports, keyed by report id
+
+    Reports live in the memory of the worker process that analyzed them. When
+    the API runs with several workers, a report id only resolves on that worker,
+    so run a single worker if clients rely on stored reports.
+    """
+
+    def __init__(self, max_reports: int = MAX_STORED_REPORTS):
+        """Initialize the report store
+
+        Args:
+            max_reports: The maximum number of reports to keep
+        """
+        self.max_reports = max_reports
+        self._reports: "OrderedDict[str, LicenseReport]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def save(self, report: LicenseReport) -> str:
+        """Store a report and assign it a report id
+
+        Args:
+            report: The report to store
+
+        Returns:
+            The id of the stored report
+        """
+        report_id = report.report_id or str(uuid.uuid4())
+        report.report_id = report_id
+        with self._lock:
+            self._reports[report_id] = report
+            self._reports.move_to_end(report_id)
+            while len(self._reports) > self.max_reports:
+                self._reports.popitem(last=False)
+        return report_id
+
+    def get(self, report_id: str) -> Optional[LicenseReport]:
+        """Get a stored report
+
+        Args:
+            report_id: The id of the report
+
+        Returns:
+            The report, or None if it is unknown or has been evicted
+        """
+        with self._lock:
+            report = self._reports.get(report_id)
+            if report is not None:
+                self._reports.move_to_end(report_id)
+            return report
+
+
+# Create report store instance
+report_store = ReportStore()
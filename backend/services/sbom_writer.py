@@ -0,0 +1,216 @@
+import json
+import re
+import uuid
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from backend.schemas.schemas import LicenseInfo, LicenseReport
+from backend.services.policy_engine import UNKNOWN_LICENSES, normalize_license
+from backend.services.spdx import LICENSE_IDS_BY_KEY, spdx_expression
+
+TOOL_NAME = "licenSage"
+TOOL_VERSION = "0.1.0"
+
+# Size of the chunks handed to the response, batching many small writes
+CHUNK_SIZE = 64 * 1024
+
+# Characters allowed in the idstring of a LicenseRef
+LICENSE_REF_PATTERN = re.compile(r"[^A-Za-z0-9.-]+")
+
+
+def is_known_license(license_type: Optional[str]) -> bool:
+    return normalize_license(license_type) not in UNKNOWN_LICENSES
+
+
+def chunked(parts: Iterable[str], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Batch small string parts into encoded chunks of roughly chunk_size bytes"""
+    buffer: List[str] = []
+    size = 0
+    for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size >= chunk_size:
+            yield "".join(buffer).encode("utf-8")
+            buffer = []
+            size = 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Gzip a stream of chunks on the fly"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def _cyclonedx_component(index: int, package: LicenseInfo) -> Dict[str, Any]:
+    component: Dict[str, Any] = {
+        "type": "library",
+        "bom-ref": f"pkg-{index}",
+        "name": package.package_name,
+    }
+    if package.version:
+        component["version"] = package.version
+    if is_known_license(package.license_type):
+        expression = spdx_expression(package.license_type)
+        if expression is None:
+            licenses: Dict[str, Any] = {"license": {"name": package.license_type}}
+        elif expression.upper() in LICENSE_IDS_BY_KEY:
+            licenses = {"license": {"id": expression}}
+        else:
+            licenses = {"expression": expression}
+        component["licenses"] = [licenses]
+
+    properties = [
+        {"name": f"licensage:{category[:-1]}", "value": term}
+        for category in ("permissions", "limitations", "obligations")
+        for term in getattr(package, category) or []
+    ]
+    if properties:
+        component["properties"] = properties
+    return component
+
+
+def iter_cyclonedx(report: LicenseReport) -> Iterator[str]:
+    """Write a report as a CycloneDX 1.5 JSON document, one component at a time
+
+    Args:
+        report: The report to export
+
+    Yields:
+        Consecutive parts of the JSON document
+    """
+    metadata = {
+        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "tools": {
+            "components": [
+                {"type": "application", "name": TOOL_NAME, "version": TOOL_VERSION}
+            ]
+        },
+    }
+    yield (
+        '{"bomFormat":"CycloneDX","specVersion":"1.5",'
+        f'"serialNumber":"urn:uuid:{uuid.uuid4()}","version":1,'
+        f'"metadata":{json.dumps(metadata)},"components":['
+    )
+    for index, package in enumerate(report.packages):
+        if index:
+            yield ","
+        yield json.dumps(_cyclonedx_component(index, package))
+    yield "]}"
+
+
+def _spdx_text(value: str) -> str:
+    """Quote free text for SPDX tag-value, which may span lines inside <text>"""
+    return f"<text>{value.replace('</text>', '')}</text>"
+
+
+class LicenseRefs:
+    """LicenseRef ids assigned to free-text licenses of an SPDX document"""
+
+    def __init__(self) -> None:
+        self.refs: Dict[str, str] = {}
+        self._used: Set[str] = set()
+
+    def get(self, license_type: str) -> str:
+        ref = self.refs.get(license_type)
+        if ref is None:
+            base = "LicenseRef-" + (
+                LICENSE_REF_PATTERN.sub("-", license_type).strip("-.") or "unknown"
+            )
+            ref = base
+            suffix = 1
+            while ref in self._used:
+                suffix += 1
+                ref = f"{base}-{suffix}"
+            self._used.add(ref)
+            self.refs[license_type] = ref
+        return ref
+
+
+def iter_spdx(report: LicenseReport) -> Iterator[str]:
+    """Write a report as an SPDX 2.3 tag-value document, one package at a time
+
+    Licenses that are SPDX ids or expressions are declared as-is. Free-text
+    licenses get a LicenseRef whose text is listed once at the end.
+
+    Args:
+        report: The report to export
+
+    Yields:
+        Consecutive parts of the tag-value document
+    """
+    name = f"licensage-{report.report_id or 'report'}"
+    yield (
+        "SPDXVersion: SPDX-2.3\n"
+        "DataLicense: CC0-1.0\n"
+        "SPDXID: SPDXRef-DOCUMENT\n"
+        f"DocumentName: {name}\n"
+        f"DocumentNamespace: https://spdx.org/spdxdocs/{name}-{uuid.uuid4()}\n"
+        f"Creator: Tool: {TOOL_NAME}-{TOOL_VERSION}\n"
+        f"Created: {datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}\n"
+    )
+    license_refs = LicenseRefs()
+    for index, package in enumerate(report.packages):
+        spdx_id = f"SPDXRef-Package-{index}"
+        declared = spdx_expression(package.license_type)
+        if declared is None:
+            declared = (
+                license_refs.get(package.license_type or "")
+                if is_known_license(package.license_type)
+                else "NOASSERTION"
+            )
+        lines = [
+            "",
+            f"PackageName: {' '.join(package.package_name.split())}",
+            f"SPDXID: {spdx_id}",
+            *([f"PackageVersion: {package.version}"] if package.version else []),
+            "PackageDownloadLocation: NOASSERTION",
+            "FilesAnalyzed: false",
+            "PackageLicenseConcluded: NOASSERTION",
+            f"PackageLicenseDeclared: {declared}",
+        ]
+        lines.extend(
+            [
+                "PackageCopyrightText: NOASSERTION",
+                f"Relationship: SPDXRef-DOCUMENT DESCRIBES {spdx_id}",
+                "",
+            ]
+        )
+        yield "\n".join(lines)
+
+    for license_type, ref in license_refs.refs.items():
+        yield (
+            f"\nLicenseID: {ref}\n"
+            f"ExtractedText: {_spdx_text(license_type)}\n"
+            f"LicenseName: {' '.join(license_type.split())}\n"
+        )
+
+
+SBOM_FORMATS = {
+    "cyclonedx": (iter_cyclonedx, "application/vnd.cyclonedx+json", "cdx.json"),
+    "spdx": (iter_spdx, "text/spdx", "spdx"),
+}
+
+
+def stream_sbom(
+    report: LicenseReport, sbom_format: str, compress: bool = False
+) -> Iterator[bytes]:
+    """Stream a report as an SBOM document in chunks
+
+    Args:
+        report: The report to export
+        sbom_format: 'cyclonedx' or 'spdx'
+        compress: Whether to gzip the document on the fly
+
+    Returns:
+        An iterator over the encoded chunks of the document
+    """
+    writer = SBOM_FORMATS[sbom_format][0]
+    chunks = chunked(writer(report))
+    return gzip_chunks(chunks) if compress else chunks
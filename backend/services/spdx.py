@@ -0,0 +1,294 @@
+import re
+from urllib.parse import unquote
+from typing import List, Optional, Set
+
+# SPDX license ids, used to restore their canonical casing
+KNOWN_LICENSE_IDS = [
+    "0BSD",
+    "AFL-3.0",
+    "AGPL-1.0",
+    "AGPL-1.0-only",
+    "AGPL-1.0-or-later",
+    "AGPL-3.0",
+    "AGPL-3.0-only",
+    "AGPL-3.0-or-later",
+    "Apache-1.1",
+    "Apache-2.0",
+    "Artistic-2.0",
+    "BlueOak-1.0.0",
+    "BSD-1-Clause",
+    "BSD-2-Clause",
+    "BSD-3-Clause",
+    "BSD-3-Clause-Clear",
+    "BSL-1.0",
+    "CC-BY-3.0",
+    "CC-BY-4.0",
+    "CC-BY-SA-3.0",
+    "CC-BY-SA-4.0",
+    "CC0-1.0",
+    "CDDL-1.0",
+    "CDDL-1.1",
+    "curl",
+    "ECL-2.0",
+    "EPL-1.0",
+    "EPL-2.0",
+    "EUPL-1.1",
+    "EUPL-1.2",
+    "GPL-2.0",
+    "GPL-2.0-only",
+    "GPL-2.0-or-later",
+    "GPL-3.0",
+    "GPL-3.0-only",
+    "GPL-3.0-or-later",
+    "HPND",
+    "ISC",
+    "LGPL-2.0",
+    "LGPL-2.0-only",
+    "LGPL-2.0-or-later",
+    "LGPL-2.1",
+    "LGPL-2.1-only",
+    "LGPL-2.1-or-later",
+    "LGPL-3.0",
+    "LGPL-3.0-only",
+    "LGPL-3.0-or-later",
+    "MIT",
+    "MIT-0",
+    "MPL-1.1",
+    "MPL-2.0",
+    "MPL-2.0-no-copyleft-exception",
+    "MS-PL",
+    "MS-RL",
+    "NCSA",
+    "OFL-1.1",
+    "OpenSSL",
+    "PostgreSQL",
+    "PSF-2.0",
+    "Python-2.0",
+    "Ruby",
+    "Unicode-DFS-2016",
+    "Unlicense",
+    "UPL-1.0",
+    "W3C",
+    "WTFPL",
+    "X11",
+    "Zlib",
+    "ZPL-2.1",
+]
+LICENSE_IDS_BY_KEY = {
+    license_id.upper(): license_id for license_id in KNOWN_LICENSE_IDS
+}
+
+# Deprecated GNU ids and the current ids they stand for
+DEPRECATED_IDS = {
+    license_id: f"{license_id}-ONLY"
+    for license_id in (
+        "AGPL-1.0",
+        "AGPL-3.0",
+        "GPL-1.0",
+        "GPL-2.0",
+        "GPL-3.0",
+        "LGPL-2.0",
+        "LGPL-2.1",
+        "LGPL-3.0",
+    )
+}
+
+# License names used by PyPI classifiers, package metadata and NuGet license URLs
+LICENSE_ALIASES = {
+    "GNU AFFERO GENERAL PUBLIC LICENSE V3": "AGPL-3.0-only",
+    "GNU AFFERO GENERAL PUBLIC LICENSE V3 OR LATER (AGPLV3+)": "AGPL-3.0-or-later",
+    "AGPLV3": "AGPL-3.0-only",
+    "AGPLV3+": "AGPL-3.0-or-later",
+    "GNU GENERAL PUBLIC LICENSE V2 (GPLV2)": "GPL-2.0-only",
+    "GNU GENERAL PUBLIC LICENSE V2 OR LATER (GPLV2+)": "GPL-2.0-or-later",
+    "GNU GENERAL PUBLIC LICENSE V3 (GPLV3)": "GPL-3.0-only",
+    "GNU GENERAL PUBLIC LICENSE V3 OR LATER (GPLV3+)": "GPL-3.0-or-later",
+    "GPLV2": "GPL-2.0-only",
+    "GPLV2+": "GPL-2.0-or-later",
+    "GPLV3": "GPL-3.0-only",
+    "GPLV3+": "GPL-3.0-or-later",
+    "GNU LESSER GENERAL PUBLIC LICENSE V2 (LGPLV2)": "LGPL-2.0-only",
+    "GNU LESSER GENERAL PUBLIC LICENSE V2 OR LATER (LGPLV2+)": "LGPL-2.0-or-later",
+    "GNU LESSER GENERAL PUBLIC LICENSE V3 (LGPLV3)": "LGPL-3.0-only",
+    "GNU LESSER GENERAL PUBLIC LICENSE V3 OR LATER (LGPLV3+)": "LGPL-3.0-or-later",
+    "APACHE 2.0": "Apache-2.0",
+    "APACHE-2": "Apache-2.0",
+    "APACHE LICENSE 2.0": "Apache-2.0",
+    "APACHE LICENSE, VERSION 2.0": "Apache-2.0",
+    "APACHE SOFTWARE LICENSE 2.0": "Apache-2.0",
+    "BOOST SOFTWARE LICENSE 1.0 (BSL-1.0)": "BSL-1.0",
+    "CC0 1.0 UNIVERSAL (CC0 1.0) PUBLIC DOMAIN DEDICATION": "CC0-1.0",
+    "ECLIPSE PUBLIC LICENSE 1.0 (EPL-1.0)": "EPL-1.0",
+    "ECLIPSE PUBLIC LICENSE 2.0 (EPL-2.0)": "EPL-2.0",
+    "EUROPEAN UNION PUBLIC LICENCE 1.2 (EUPL 1.2)": "EUPL-1.2",
+    "ISC LICENSE (ISCL)": "ISC",
+    "MIT LICENSE": "MIT",
+    "MIT NO ATTRIBUTION LICENSE (MIT-0)": "MIT-0",
+    "MOZILLA PUBLIC LICENSE 1.1 (MPL 1.1)": "MPL-1.1",
+    "MOZILLA PUBLIC LICENSE 2.0 (MPL 2.0)": "MPL-2.0",
+    "PYTHON SOFTWARE FOUNDATION LICENSE": "PSF-2.0",
+    "THE UNLICENSE (UNLICENSE)": "Unlicense",
+    "UNIVERSAL PERMISSIVE LICENSE (UPL)": "UPL-1.0",
+    "ZLIB/LIBPNG LICENSE": "Zlib",
+    "ZOPE PUBLIC LICENSE": "ZPL-2.1",
+}
+
+# License URLs and the SPDX expression they name, e.g. licenses.nuget.org/MIT
+LICENSE_URL_PATTERNS = [
+    (re.compile(r"^https?://licenses\.nuget\.org/(.+?)/?$", re.I), r"\1"),
+    (re.compile(r"^https?://opensource\.org/licenses?/([\w.+-]+?)/?$", re.I), r"\1"),
+    (re.compile(r"^https?://spdx\.org/licenses/([\w.+-]+?)(\.html)?$", re.I), r"\1"),
+    (
+        re.compile(r"^https?://(www\.)?apache\.org/licenses/LICENSE-2\.0", re.I),
+        "Apache-2.0",
+    ),
+]
+
+OPERATORS = {"AND", "OR", "WITH"}
+
+TOKEN_PATTERN = re.compile(r"\(|\)|[^\s()]+")
+
+# Ids are letters, digits, '-' and '.', with '+' for "or later"
+ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9.-]*\+?$")
+
+# Words that only pass as ids when they are known, so 'BSD' or 'UNLICENSED'
+# are not mistaken for SPDX ids
+BARE_WORD_PATTERN = re.compile(r"^[A-Za-z]+$")
+
+
+def _normalize_text(value: str) -> str:
+    return " ".join(value.split()).upper()
+
+
+def _is_license_id(token: str) -> bool:
+    if token.startswith(("LicenseRef-", "DocumentRef-")):
+        return True
+    if token.upper() in LICENSE_IDS_BY_KEY:
+        return True
+    return bool(ID_PATTERN.match(token)) and not BARE_WORD_PATTERN.match(token)
+
+
+def _parse_expression(tokens: List[str]) -> bool:
+    """Check that tokens form an SPDX license expression"""
+    position = 0
+
+    def term() -> bool:
+        nonlocal position
+        if position >= len(tokens):
+            return False
+        if tokens[position] == "(":
+            position += 1
+            if not expression() or position >= len(tokens) or tokens[position] != ")":
+                return False
+            position += 1
+            return True
+        if tokens[position] in OPERATORS or not _is_license_id(tokens[position]):
+            return False
+        position += 1
+        if position < len(tokens) and tokens[position] == "WITH":
+            # License exceptions, e.g. Classpath-exception-2.0
+            position += 1
+            if position >= len(tokens) or not ID_PATTERN.match(tokens[position]):
+                return False
+            position += 1
+        return True
+
+    def expression() -> bool:
+        nonlocal position
+        if not term():
+            return False
+        while position < len(tokens) and tokens[position] in ("AND", "OR"):
+            position += 1
+            if not term():
+                return False
+        return True
+
+    return expression() and position == len(tokens)
+
+
+def spdx_expression(license_type: Optional[str]) -> Optional[str]:
+    """Convert a license type to an SPDX license expression
+
+    Known license names, PyPI classifiers and license URLs are mapped to their
+    SPDX id, valid ids and expressions are returned with canonical casing.
+
+    Args:
+        license_type: The license type reported by a registry or the analysis
+
+    Returns:
+        The SPDX expression, or None if the license type is free text
+    """
+    value = (license_type or "").strip()
+    if not value:
+        return None
+    alias = LICENSE_ALIASES.get(_normalize_text(value))
+    if alias:
+        return alias
+    for pattern, template in LICENSE_URL_PATTERNS:
+        match = pattern.match(value)
+        if match:
+            value = unquote(match.expand(template))
+            break
+
+    tokens = TOKEN_PATTERN.findall(value)
+    if not _parse_expression(tokens):
+        return None
+    expression = " ".join(
+        LICENSE_IDS_BY_KEY.get(token.upper(), token) for token in tokens
+    )
+    return expression.replace("( ", "(").replace(" )", ")")
+
+
+def license_ids(license_type: Optional[str], deprecated: bool = True) -> Set[str]:
+    """Return the upper-cased SPDX ids a license type refers to
+
+    Deprecated GNU ids are mapped to their -only form and a trailing '+' to the
+    -or-later form, so equivalent spellings compare equal. Exceptions named
+    after WITH are not license ids and are left out.
+
+    Args:
+        license_type: The license type reported by a registry or the analysis
+        deprecated: Map deprecated GNU ids such as GPL-3.0 to GPL-3.0-only
+
+    Returns:
+        The ids of every license in the expression, empty for free text
+    """
+    expression = spdx_expression(license_type)
+    if expression is None:
+        return set()
+    ids: Set[str] = set()
+    tokens = TOKEN_PATTERN.findall(expression)
+    for index, token in enumerate(tokens):
+        if token in OPERATORS or token in ("(", ")"):
+            continue
+        if index and tokens[index - 1] == "WITH":
+            continue
+        ids.add(canonical_license_id(token, deprecated))
+    return ids
+
+
+def canonical_license_id(license_id: str, deprecated: bool = True) -> str:
+    """Upper-case an SPDX id and spell '+' as -or-later
+
+    Args:
+        license_id: A single SPDX license id
+        deprecated: Also map deprecated GNU ids such as GPL-3.0 to GPL-3.0-only
+
+    Returns:
+        The canonical, upper-cased id
+    """
+    key = license_id.upper()
+    if key.endswith("+"):
+        key = key[:-1]
+        return key if key.endswith("-OR-LATER") else f"{key}-OR-LATER"
+    return DEPRECATED_IDS.get(key, key) if deprecated else key
+
+
+def license_id_matches(license_id: str, rule: str) -> bool:
+    """Check whether a canonical license id is covered by a canonical policy id
+
+    An id matches itself; a GNU-style id without -only/-or-later, e.g. AGPL-3.0,
+    also matches both of its variants. Matching never uses prefixes, so MIT does
+    not match MIT-0.
+    """
+    return license_id == rule or license_id in (f"{rule}-ONLY", f"{rule}-OR-LATER")
@@ -116,7 +116,18 @@ def main():
     else:  # Upload Dependency File
         # File type detection will be handled by the backend
         uploaded_file = st.file_uploader(
-            "Upload your dependency file", type=["txt", "json", "toml", "csproj", "xml"]
+            "Upload your dependency file",
+            type=[
+                "txt",
+                "json",
+                "toml",
+                "csproj",
+                "fsproj",
+                "vbproj",
+                "xml",
+                "config",
+                "props",
+            ],
         )
 
         if st.button("Analyze File"):
@@ -182,6 +193,8 @@ def display_results(data):
         col1, col2 = st.columns([1, 3])
         with col1:
             st.subheader(pkg["package_name"])
+            if pkg.get("version"):
+                st.caption(f"Version: {pkg['version']}")
             st.caption(f"License: {pkg.get('license_type', 'Unknown')}")
 
         with col2:
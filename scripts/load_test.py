@@ -0,0 +1,394 @@
+"""Load test for the LicenSage API across uvicorn worker counts.
+
+Starts the API under each requested number of uvicorn workers, drives
+/api/dependency/upload and /api/github/analyze with a seeded mix of manifest
+sizes at a fixed concurrency, and reports latency percentiles, throughput,
+error rates and the peak RSS of every worker process.
+
+The analysis endpoints do not call the LLM or package registries yet, so the
+server runs with placeholder API keys and no external traffic. Admission limits
+are raised out of the way unless --keep-admission is given.
+
+Usage:
+    python scripts/load_test.py --workers 1,2,4 --concurrency 64 --duration 30
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (label, number of packages, weight) of the uploaded manifests
+MANIFEST_SIZES = [("small", 10, 70), ("medium", 200, 25), ("large", 5000, 5)]
+
+MANIFEST_TYPES = ["requirements.txt", "package.json", "pyproject.toml", "app.csproj"]
+
+# Seconds between RSS samples of the worker processes
+RSS_INTERVAL = 0.5
+
+# Environment of the server under test
+SERVER_ENV = {
+    "OPENAI_API_KEY": "load-test",
+    "GOOGLE_API_KEY": "load-test",
+    "DEBUG": "False",
+    # The load generator spreads requests over clients with X-Client-ID
+    "ADMISSION_TRUSTED_PROXIES": '["127.0.0.1"]',
+}
+
+# Admission limits that keep the load test from being rate limited
+UNLIMITED_ADMISSION_ENV = {
+    "ADMISSION_MAX_ACTIVE": "100000",
+    "ADMISSION_MAX_QUEUE": "100000",
+    "ADMISSION_CLIENT_CONCURRENCY": "100000",
+    "ADMISSION_CLIENT_QUEUE": "100000",
+    "ADMISSION_CLIENT_RATE": "100000",
+    "ADMISSION_CLIENT_BURST": "100000",
+}
+
+
+def build_manifest(file_type: str, size: int, rng: random.Random) -> bytes:
+    """Build a manifest of the given type with size random packages"""
+    names = [f"pkg-{rng.randrange(100000)}" for _ in range(size)]
+    if file_type == "requirements.txt":
+        content = "\n".join(f"{name}==1.{rng.randrange(20)}.0" for name in names)
+    elif file_type == "package.json":
+        content = json.dumps({"dependencies": {name: "^1.0.0" for name in names}})
+    elif file_type == "pyproject.toml":
+        deps = ",\n".join(f'    "{name}>=1.0"' for name in names)
+        content = f'[project]\nname = "load-test"\ndependencies = [\n{deps}\n]\n'
+    else:
+        refs = "\n".join(
+            f'    <PackageReference Include="{name}" Version="1.0.0" />'
+            for name in names
+        )
+        content = f"<Project>\n  <ItemGroup>\n{refs}\n  </ItemGroup>\n</Project>\n"
+    return content.encode("utf-8")
+
+
+def build_corpus(count: int, seed: int) -> List[Tuple[str, str, bytes]]:
+    """Build a reproducible corpus of (size label, filename, content) manifests"""
+    rng = random.Random(seed)
+    labels = [label for label, _, _ in MANIFEST_SIZES]
+    weights = [weight for _, _, weight in MANIFEST_SIZES]
+    sizes = {label: size for label, size, _ in MANIFEST_SIZES}
+    corpus = []
+    for _ in range(count):
+        label = rng.choices(labels, weights)[0]
+        file_type = rng.choice(MANIFEST_TYPES)
+        corpus.append((label, file_type, build_manifest(file_type, sizes[label], rng)))
+    return corpus
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+        return port
+
+
+def child_pids(pid: int) -> List[int]:
+    """Return the direct children of a process (Linux only)"""
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+
+
+def rss_bytes(pid: int) -> Optional[int]:
+    """Return the resident set size of a process (Linux only)"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def worker_pids(server_pid: int, workers: int) -> List[int]:
+    """Return the processes serving requests for a uvicorn server"""
+    if workers == 1:
+        return [server_pid]
+    # With several workers, the children of the supervisor serve the requests,
+    # skipping the multiprocessing resource tracker
+    return [
+        pid for pid in child_pids(server_pid) if "resource_tracker" not in _cmdline(pid)
+    ]
+
+
+def _cmdline(pid: int) -> str:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return f.read().replace(b"\0", b" ").decode(errors="replace")
+    except OSError:
+        return ""
+
+
+def start_server(workers: int, port: int, keep_admission: bool) -> subprocess.Popen:
+    env = {**os.environ, **SERVER_ENV}
+    if not keep_admission:
+        env.update(UNLIMITED_ADMISSION_ENV)
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "backend.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        env=env,
+        cwd=REPO_ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_until_healthy(base_url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                response = await client.get(f"{base_url}/health")
+                if response.status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become healthy")
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class Recorder:
+    """Latencies and outcomes of the requests of one run"""
+
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = {}
+        self.statuses: Dict[str, Dict[str, int]] = {}
+
+    def record(self, endpoint: str, latency: float, status: str) -> None:
+        self.latencies.setdefault(endpoint, []).append(latency)
+        statuses = self.statuses.setdefault(endpoint, {})
+        statuses[status] = statuses.get(status, 0) + 1
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        endpoints = {}
+        for endpoint, latencies in self.latencies.items():
+            statuses = self.statuses[endpoint]
+            errors = sum(count for status, count in statuses.items() if status != "200")
+            endpoints[endpoint] = {
+                "requests": len(latencies),
+                "throughput_rps": round(len(latencies) / elapsed, 2),
+                "error_rate": round(errors / len(latencies), 4),
+                "statuses": statuses,
+                "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+                "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+                "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+            }
+        all_latencies = [x for latencies in self.latencies.values() for x in latencies]
+        total_errors = sum(
+            count
+            for statuses in self.statuses.values()
+            for status, count in statuses.items()
+            if status != "200"
+        )
+        return {
+            "requests": len(all_latencies),
+            "throughput_rps": round(len(all_latencies) / elapsed, 2),
+            "error_rate": round(total_errors / max(len(all_latencies), 1), 4),
+            "p50_ms": round(percentile(all_latencies, 0.50) * 1000, 1),
+            "p95_ms": round(percentile(all_latencies, 0.95) * 1000, 1),
+            "p99_ms": round(percentile(all_latencies, 0.99) * 1000, 1),
+            "endpoints": endpoints,
+        }
+
+
+async def drive(
+    base_url: str,
+    corpus: List[Tuple[str, str, bytes]],
+    args: argparse.Namespace,
+    recorder: Recorder,
+) -> float:
+    """Send requests at the configured concurrency until the run is over
+
+    Returns:
+        The elapsed time of the run in seconds
+    """
+    deadline = time.monotonic() + args.duration
+    limits = httpx.Limits(max_connections=args.concurrency)
+    timeout = httpx.Timeout(args.timeout)
+
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=timeout
+    ) as client:
+
+        async def user(index: int) -> None:
+            headers = {"X-Client-ID": f"load-test-{index % args.clients}"}
+            # Each user draws from its own generator, so its request sequence
+            # does not depend on how the users are scheduled
+            rng = random.Random(args.seed + index)
+            position = index
+            while time.monotonic() < deadline:
+                if rng.random() < args.github_ratio:
+                    endpoint = "/api/github/analyze"
+                    request = client.post(
+                        endpoint,
+                        json={"url": f"https://github.com/load-test/repo-{position}"},
+                        headers=headers,
+                    )
+                else:
+                    label, filename, content = corpus[position % len(corpus)]
+                    endpoint = f"/api/dependency/upload [{label}]"
+                    request = client.post(
+                        "/api/dependency/upload",
+                        files={"file": (filename, content, "text/plain")},
+                        headers=headers,
+                    )
+                position += args.concurrency
+
+                started = time.monotonic()
+                try:
+                    response = await request
+                    status = str(response.status_code)
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                recorder.record(endpoint, time.monotonic() - started, status)
+
+        started = time.monotonic()
+        await asyncio.gather(*(user(index) for index in range(args.concurrency)))
+        return time.monotonic() - started
+
+
+async def sample_rss(
+    server_pid: int, workers: int, peaks: Dict[int, int], stop: asyncio.Event
+) -> None:
+    while not stop.is_set():
+        for pid in worker_pids(server_pid, workers):
+            rss = rss_bytes(pid)
+            if rss is not None:
+                peaks[pid] = max(peaks.get(pid, 0), rss)
+        try:
+            await asyncio.wait_for(stop.wait(), RSS_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run(
+    workers: int, corpus: List[Tuple[str, str, bytes]], args: argparse.Namespace
+) -> Dict[str, Any]:
+    """Start the server with a number of workers and load test it"""
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = start_server(workers, port, args.keep_admission)
+    try:
+        await wait_until_healthy(base_url)
+        recorder = Recorder()
+        peaks: Dict[int, int] = {}
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(sample_rss(server.pid, workers, peaks, stop))
+        elapsed = await drive(base_url, corpus, args, recorder)
+        stop.set()
+        await sampler
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    result = recorder.summary(elapsed)
+    result["workers"] = workers
+    result["concurrency"] = args.concurrency
+    result["worker_peak_rss_mb"] = [
+        round(rss / (1024 * 1024), 1) for rss in sorted(peaks.values())
+    ]
+    return result
+
+
+def print_result(result: Dict[str, Any]) -> None:
+    print(
+        f"\nworkers={result['workers']} concurrency={result['concurrency']}: "
+        f"{result['requests']} requests, {result['throughput_rps']} req/s, "
+        f"errors {result['error_rate']:.2%}, p50 {result['p50_ms']} ms, "
+        f"p95 {result['p95_ms']} ms, p99 {result['p99_ms']} ms"
+    )
+    print(f"  peak RSS per worker (MB): {result['worker_peak_rss_mb']}")
+    for endpoint, stats in sorted(result["endpoints"].items()):
+        print(
+            f"  {endpoint:<40} {stats['requests']:>7} req "
+            f"{stats['throughput_rps']:>8} req/s  errors {stats['error_rate']:.2%}  "
+            f"p50 {stats['p50_ms']:>8} ms  p95 {stats['p95_ms']:>8} ms  "
+            f"p99 {stats['p99_ms']:>8} ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--workers",
+        default="1,2,4",
+        help="Comma-separated uvicorn worker counts to test",
+    )
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument(
+        "--clients",
+        type=int,
+        default=8,
+        help="Number of distinct X-Client-ID values the requests are spread over",
+    )
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument(
+        "--github-ratio",
+        type=float,
+        default=0.2,
+        help="Share of requests sent to /api/github/analyze",
+    )
+    parser.add_argument("--corpus-size", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument(
+        "--keep-admission",
+        action="store_true",
+        help="Keep the configured admission limits instead of disabling them",
+    )
+    parser.add_argument("--json", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.corpus_size, args.seed)
+    results = []
+    for workers in [int(count) for count in args.workers.split(",")]:
+        result = asyncio.run(run(workers, corpus, args))
+        print_result(result)
+        results.append(result)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()